@@ -15,7 +15,7 @@
 
 from .tie_breaker import TieBreaker
 from abc import ABCMeta, abstractmethod
-from copy import copy, deepcopy
+from copy import copy
 import types
 
 
@@ -23,10 +23,11 @@ import types
 class VotingSystem(object, metaclass=ABCMeta):
     @abstractmethod
     def __init__(self, ballots, tie_breaker=None):
+
+        # Fill in missing counts on copies, leaving the caller's ballots as they are
         self.ballots = ballots
-        for ballot in self.ballots:
-            if "count" not in ballot:
-                ballot["count"] = 1
+        if any("count" not in ballot for ballot in ballots):
+            self.ballots = [ballot if "count" in ballot else dict(ballot, count=1) for ballot in ballots]
         self.tie_breaker = tie_breaker
         if isinstance(self.tie_breaker, list):
             self.tie_breaker = TieBreaker(self.tie_breaker)
@@ -40,10 +41,15 @@ class VotingSystem(object, metaclass=ABCMeta):
             data["tie_breaker"] = self.tie_breaker.as_list()
         return data
 
-    def break_ties(self, tied_objects, reverse_order=False):
+    # Create the tie breaker, or draw the ordering of one that was created
+    # without candidates, over the full set of candidates
+    def prepare_tie_breaker(self):
         if self.tie_breaker is None:
             self.tie_breaker = TieBreaker(self.candidates)
-        return self.tie_breaker.break_ties(tied_objects, reverse_order)
+        return self.tie_breaker.prepare(self.candidates)
+
+    def break_ties(self, tied_objects, reverse_order=False):
+        return self.prepare_tie_breaker().break_ties(tied_objects, reverse_order)
 
 
 # Given a set of candidates, return a fixed number of winners
@@ -133,7 +139,12 @@ class AbstractOrderingVotingSystem(OrderingVotingSystem, metaclass=ABCMeta):
     def calculate_results(self):
         self.order = []
         self.rounds = []
-        remaining_ballots = deepcopy(self.ballots)
+        remaining_ballots = self.ballots
+
+        # Share a single tie breaker with every round's election
+        if hasattr(self, 'candidates'):
+            self.prepare_tie_breaker()
+
         remaining_candidates = True
         while (
             (remaining_candidates is True or len(remaining_candidates) > 1)
@@ -141,17 +152,17 @@ class AbstractOrderingVotingSystem(OrderingVotingSystem, metaclass=ABCMeta):
         ):
 
             # Given the remaining ballots, who should win?
-            result = self.single_winner_class(deepcopy(remaining_ballots), tie_breaker=self.tie_breaker)
+            result = self.single_winner_class(remaining_ballots, tie_breaker=self.tie_breaker)
 
             # Mark the candidate that won
             r = {'winner': result.winner}
             self.order.append(r['winner'])
 
             # Mark any ties that might have occurred
-            if hasattr(result, 'tie_breaker'):
+            if self.tie_breaker is None:
                 self.tie_breaker = result.tie_breaker
-                if hasattr(result, 'tied_winners'):
-                    r['tied_winners'] = result.tied_winners
+            if hasattr(result, 'tied_winners'):
+                r['tied_winners'] = result.tied_winners
             self.rounds.append(r)
 
             # Remove the candidate from the remaining candidates and ballots
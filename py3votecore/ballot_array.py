@@ -0,0 +1,199 @@
+# Copyright (C) 2009, Brad Beattie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+import os
+
+SHARD_SIZE = 65536
+
+# Layout of the shared buffer: (name, typecode, item size)
+SEGMENTS = (("rankings", "i", 4), ("offsets", "q", 8), ("positions", "q", 8), ("weights", "d", 8))
+
+# Views onto the shared buffer, as attached by the current process
+_shared = {}
+
+
+# Attach the current process to the given shared buffer, unless it already is
+def _attach(name, lengths):
+    if _shared.get("name") == name:
+        return
+    _detach()
+    memory = SharedMemory(name=name)
+    _shared["name"] = name
+    _shared["memory"] = memory
+    _shared.update(_views(memory, lengths))
+
+
+def _detach():
+    memory = _shared.pop("memory", None)
+    _shared.pop("name", None)
+    for view in _shared.values():
+        view.release()
+    _shared.clear()
+    if memory is not None:
+        memory.close()
+
+
+def _views(memory, lengths):
+    views = {}
+    offset = 0
+    for (segment, typecode, size), length in zip(SEGMENTS, lengths):
+        views[segment] = memory.buf[offset:offset + length * size].cast(typecode)
+        offset += length * size
+    return views
+
+
+# Reweight and advance every ballot in the shard past removed candidates,
+# then tally the shard's first preferences. Every shard owns a disjoint slice
+# of the shared positions and weights, so no locking is needed. Workers attach
+# to the buffer named in the task, so a pool outlives the buffers it counts.
+def _count_shard(task, views=None):
+    start, end, removed, factors, name, lengths = task
+    if views is None:
+        _attach(name, lengths)
+        views = _shared
+    rankings, offsets, positions, weights = views["rankings"], views["offsets"], views["positions"], views["weights"]
+    tallies = [0] * len(removed)
+    voters = 0
+    active = False
+    for ballot in range(start, end):
+        position = positions[ballot]
+        stop = offsets[ballot + 1]
+        if position < stop and removed[rankings[position]]:
+            if rankings[position] in factors:
+                weights[ballot] *= factors[rankings[position]]
+            while position < stop and removed[rankings[position]]:
+                position += 1
+            positions[ballot] = position
+        if position < stop:
+            weight = weights[ballot]
+            tallies[rankings[position]] += weight
+            voters += weight
+            active = active or weight > 0
+    return tallies, voters, active
+
+
+# This class stores ranked ballots as flat integer arrays in shared memory so
+# that a pool of worker processes can count fixed-size shards of the profile
+# without the ballots being pickled for each task. Shards are always combined
+# in the same order, so the count does not depend on the number of workers.
+class BallotArray(object):
+
+    def __init__(self, ballots, candidates=None, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = None
+        self.memory = None
+        self.views = {}
+        self.load(ballots, candidates)
+
+    # Copy the profile into a new shared buffer in place of the current one,
+    # keeping the worker pool. On failure, the buffer and pool are released.
+    def load(self, ballots, candidates=None):
+        rankings, offsets, weights = [], [0], []
+        for ballot in ballots:
+            ranking = ballot["ballot"]
+            if candidates is not None:
+                ranking = [candidate for candidate in ranking if candidate in candidates]
+            rankings.extend(ranking)
+            offsets.append(len(rankings))
+            weights.append(float(ballot["count"]))
+        self.candidate_list = sorted(set(rankings))
+        self.candidates = set(self.candidate_list)
+        index = dict((candidate, i) for i, candidate in enumerate(self.candidate_list))
+        self.removed = bytearray(len(self.candidate_list))
+
+        self.release_memory()
+        try:
+            # Copy the profile into a single shared buffer
+            self.lengths = (len(rankings), len(offsets), len(weights), len(weights))
+            self.memory = SharedMemory(create=True, size=max(1, sum(
+                length * size for (segment, typecode, size), length in zip(SEGMENTS, self.lengths)
+            )))
+            self.views = _views(self.memory, self.lengths)
+            for i, candidate in enumerate(rankings):
+                self.views["rankings"][i] = index[candidate]
+            for i, offset in enumerate(offsets):
+                self.views["offsets"][i] = offset
+            for i, weight in enumerate(weights):
+                self.views["positions"][i] = offsets[i]
+                self.views["weights"][i] = weight
+            self.shards = [(start, min(start + SHARD_SIZE, len(weights))) for start in range(0, len(weights), SHARD_SIZE)]
+
+            if self.pool is None and self.workers > 1 and len(self.shards) > 1:
+                self.pool = Pool(min(self.workers, len(self.shards)))
+            self.count()
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def count(self, factors=None):
+        tasks = [
+            (start, end, bytes(self.removed), factors or {}, self.memory.name, self.lengths)
+            for start, end in self.shards
+        ]
+        if self.pool is None:
+            results = [_count_shard(task, self.views) for task in tasks]
+        else:
+            results = self.pool.map(_count_shard, tasks)
+
+        self.first_preferences = [0] * len(self.candidate_list)
+        self.active_voters = 0
+        self.active = False
+        for tallies, voters, active in results:
+            for i, tally in enumerate(tallies):
+                self.first_preferences[i] += tally
+            self.active_voters += voters
+            self.active = self.active or active
+
+    def tallies(self):
+        return dict(
+            (candidate, self.first_preferences[i])
+            for i, candidate in enumerate(self.candidate_list)
+            if not self.removed[i]
+        )
+
+    def voters(self):
+        return self.active_voters
+
+    def has_active_ballots(self):
+        return self.active
+
+    # Remove the given candidates from every ballot. Ballots whose first
+    # preference is a key of factors are reweighted by the matching factor.
+    def remove_candidates(self, candidates, factors=None):
+        index = dict((candidate, i) for i, candidate in enumerate(self.candidate_list))
+        for candidate in candidates:
+            self.removed[index[candidate]] = 1
+        self.count(dict((index[candidate], factor) for candidate, factor in (factors or {}).items()))
+        return self
+
+    def release_memory(self):
+        for view in self.views.values():
+            view.release()
+        self.views = {}
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+    # Release the shared buffer and stop the workers. Closing twice is harmless.
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+        self.release_memory()
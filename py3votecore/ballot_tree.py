@@ -0,0 +1,98 @@
+# Copyright (C) 2009, Brad Beattie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+class BallotTreeNode(object):
+    __slots__ = ("count", "children")
+
+    def __init__(self):
+        self.count = 0
+        self.children = {}
+
+
+# This class stores ranked ballots as a count-weighted prefix tree. Each node
+# holds the total weight of the ballots passing through it, so the first
+# preference tallies are simply the weights of the root's children. Removing
+# a candidate splices its children into its parent, which moves whole groups
+# of ballots sharing a prefix at once.
+class BallotTree(object):
+
+    def __init__(self, ballots=(), candidates=None):
+        self.root = BallotTreeNode()
+        self.candidates = set()
+        for ballot in ballots:
+            ranking = ballot["ballot"]
+            if candidates is not None:
+                ranking = [candidate for candidate in ranking if candidate in candidates]
+            self.add(ranking, ballot["count"])
+
+    def add(self, ranking, count):
+        node = self.root
+        for candidate in ranking:
+            node = self.graft(node, candidate, count)
+
+    def tallies(self):
+        tallies = dict.fromkeys(self.candidates, 0)
+        for candidate, node in self.root.children.items():
+            tallies[candidate] += node.count
+        return tallies
+
+    def voters(self):
+        return sum(node.count for node in self.root.children.values())
+
+    def has_active_ballots(self):
+        return any(node.count > 0 for node in self.root.children.values())
+
+    # Remove the given candidates from every ballot. Ballots whose first
+    # preference is a key of factors are reweighted by the matching factor.
+    def remove_candidates(self, candidates, factors=None):
+        factors = factors or {}
+        root = BallotTreeNode()
+        self.candidates = set()
+        stack = []
+        for candidate, node in self.root.children.items():
+            if candidate in candidates:
+                stack.append((node, root, factors.get(candidate, 1)))
+            else:
+                stack.append((node, self.graft(root, candidate, node.count), 1))
+
+        # Copy each subtree onto its target, splicing out removed candidates
+        while stack:
+            source, target, factor = stack.pop()
+            for candidate, node in source.children.items():
+                if candidate in candidates:
+                    stack.append((node, target, factor))
+                else:
+                    stack.append((node, self.graft(target, candidate, node.count * factor), factor))
+
+        self.root = root
+        return self
+
+    def graft(self, target, candidate, count):
+        child = target.children.get(candidate)
+        if child is None:
+            child = target.children[candidate] = BallotTreeNode()
+        child.count += count
+        self.candidates.add(candidate)
+        return child
+
+    def __len__(self):
+        size = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            size += len(node.children)
+            stack.extend(node.children.values())
+        return size
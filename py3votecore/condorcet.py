@@ -19,43 +19,62 @@ from pygraph.classes.digraph import digraph
 import itertools
 
 
+# This class holds a standardized ballot. Only the ranked candidates are
+# stored; every other candidate is implicitly tied at lowest_preference,
+# below all of them.
+class SparseBallot(dict):
+
+    def __init__(self, ratings, lowest_preference):
+        super(SparseBallot, self).__init__(ratings)
+        self.lowest_preference = lowest_preference
+
+    def __missing__(self, candidate):
+        return self.lowest_preference
+
+
 class CondorcetHelper(object):
 
     BALLOT_NOTATION_GROUPING = 0
     BALLOT_NOTATION_RANKING = 1
     BALLOT_NOTATION_RATING = 2
 
+    profile = None
+
     def standardize_ballots(self, ballots, ballot_notation):
 
-        self.ballots = ballots
-        if ballot_notation == CondorcetHelper.BALLOT_NOTATION_GROUPING:
-            for ballot in self.ballots:
-                new_ballot = {}
+        # A profile has already standardized, aggregated and tallied its ballots
+        if isinstance(ballots, ElectionProfile):
+            self.profile = ballots
+            self.ballots = ballots.ballots
+            self.candidates = set(ballots.candidates)
+            return
+
+        if ballot_notation not in (
+            CondorcetHelper.BALLOT_NOTATION_GROUPING,
+            CondorcetHelper.BALLOT_NOTATION_RANKING,
+            CondorcetHelper.BALLOT_NOTATION_RATING,
+            None,
+        ):
+            raise Exception("Unknown notation specified", ballot_notation)
+
+        # Rate the candidates of each ballot on a copy, leaving the caller's
+        # ballots as they are
+        self.ballots = []
+        self.candidates = set()
+        for ballot in ballots:
+            if ballot_notation == CondorcetHelper.BALLOT_NOTATION_GROUPING:
+                ratings = {}
                 r = len(ballot["ballot"])
                 for rank in ballot["ballot"]:
                     for candidate in rank:
-                        new_ballot[candidate] = r
+                        ratings[candidate] = r
                     r -= 1
-                ballot["ballot"] = new_ballot
-        elif ballot_notation == CondorcetHelper.BALLOT_NOTATION_RANKING:
-            for ballot in self.ballots:
-                for candidate, rating in ballot["ballot"].items():
-                    ballot["ballot"][candidate] = -float(rating)
-        elif ballot_notation == CondorcetHelper.BALLOT_NOTATION_RATING or ballot_notation is None:
-            for ballot in self.ballots:
-                for candidate, rating in ballot["ballot"].items():
-                    ballot["ballot"][candidate] = float(rating)
-        else:
-            raise Exception("Unknown notation specified", ballot_notation)
-
-        self.candidates = set()
-        for ballot in self.ballots:
-            self.candidates |= set(ballot["ballot"].keys())
-
-        for ballot in self.ballots:
-            lowest_preference = min(ballot["ballot"].values()) - 1
-            for candidate in self.candidates - set(ballot["ballot"].keys()):
-                ballot["ballot"][candidate] = lowest_preference
+            elif ballot_notation == CondorcetHelper.BALLOT_NOTATION_RANKING:
+                ratings = dict((candidate, -float(rating)) for candidate, rating in ballot["ballot"].items())
+            else:
+                ratings = dict((candidate, float(rating)) for candidate, rating in ballot["ballot"].items())
+            self.candidates |= set(ratings.keys())
+            self.ballots.append(dict(ballot, ballot=SparseBallot(ratings, min(ratings.values()) - 1)))
 
     def graph_winner(self):
         losing_candidates = set([edge[1] for edge in self.graph.edges()])
@@ -68,18 +87,83 @@ class CondorcetHelper(object):
         else:
             self.condorcet_completion_method()
 
+    # Count the voters preferring candidate over other, and those preferring
+    # other over candidate
+    def preferences(self, candidate, other):
+        if self.profile is not None:
+            i, j = self.profile.candidate_index[candidate], self.profile.candidate_index[other]
+            return self.profile.pairwise[i][j], self.profile.pairwise[j][i]
+        preferred, opposed = 0, 0
+        for ballot in self.ballots:
+            if ballot["ballot"][candidate] > ballot["ballot"][other]:
+                preferred += ballot["count"]
+            elif ballot["ballot"][other] > ballot["ballot"][candidate]:
+                opposed += ballot["count"]
+        return preferred, opposed
+
+    # Find the Condorcet winner, if any, without tallying every pair. A
+    # knockout scan leaves the only candidate that could beat all the others,
+    # which is then checked against each of them.
+    def condorcet_winner(self):
+        candidates = sorted(self.candidates, key=repr)
+        if len(candidates) == 0:
+            return None
+        champion = candidates[0]
+        for challenger in candidates[1:]:
+            preferred, opposed = self.preferences(champion, challenger)
+            if preferred <= opposed:
+                champion = challenger
+        for candidate in candidates:
+            if candidate != champion:
+                preferred, opposed = self.preferences(champion, candidate)
+                if preferred <= opposed:
+                    return None
+        return champion
+
+    def pairwise_graph(self):
+        if self.profile is not None:
+            return self.profile.graph()
+        return self.ballots_into_graph(self.candidates, self.ballots)
+
     @staticmethod
     def ballots_into_graph(candidates, ballots):
+        candidate_list = list(candidates)
+        pairwise = CondorcetHelper.pairwise_tally(candidate_list, ballots)
         graph = digraph()
-        graph.add_nodes(candidates)
-        for pair in itertools.permutations(candidates, 2):
-            graph.add_edge(pair, sum([
-                ballot["count"]
-                for ballot in ballots
-                if ballot["ballot"][pair[0]] > ballot["ballot"][pair[1]]
-            ]))
+        graph.add_nodes(candidate_list)
+        for i, j in itertools.permutations(range(len(candidate_list)), 2):
+            graph.add_edge((candidate_list[i], candidate_list[j]), pairwise[i][j])
         return graph
 
+    # Tally how many voters prefer each candidate over each other candidate,
+    # looking only at the candidates each ballot ranks explicitly. A ranked
+    # candidate beats every unranked one, so beyond the comparisons between
+    # ranked candidates, candidate i beats j on all the ballots ranking i less
+    # those ranking both. Each ballot costs O(k^2) for its k ranked candidates.
+    @staticmethod
+    def pairwise_tally(candidate_list, ballots):
+        index = dict((candidate, i) for i, candidate in enumerate(candidate_list))
+        size = len(candidate_list)
+        pairwise = [[0] * size for i in range(size)]
+        ranked_together = [[0] * size for i in range(size)]
+        ranked = [0] * size
+        for ballot in ballots:
+            count = ballot["count"]
+            ratings = [(index[candidate], rating) for candidate, rating in ballot["ballot"].items() if candidate in index]
+            for i, rating in ratings:
+                ranked[i] += count
+                row = pairwise[i]
+                together_row = ranked_together[i]
+                for j, other_rating in ratings:
+                    together_row[j] += count
+                    if rating > other_rating:
+                        row[j] += count
+        for i in range(size):
+            for j in range(size):
+                if i != j:
+                    pairwise[i][j] += ranked[i] - ranked_together[i][j]
+        return pairwise
+
     @staticmethod
     def edge_weights(graph):
         return dict([
@@ -97,18 +181,82 @@ class CondorcetHelper(object):
             if weights[1] >= weights[0]:
                 graph.del_edge(pairs[0])
 
+
+# This class standardizes, aggregates and tallies a set of ballots once, so
+# that several Condorcet methods can be computed from the same precomputation
+# by passing the profile in place of the ballots. The caller's ballots are left
+# untouched. Identical ballots are merged, and the ranking of each distinct
+# ballot is kept as a tuple of (candidate index, rating) pairs following
+# candidate_list, with every unlisted candidate tied last. pairwise[i][j]
+# holds the number of voters preferring candidate_list[i] over
+# candidate_list[j].
+class ElectionProfile(CondorcetHelper):
+
+    def __init__(self, ballots, ballot_notation=None):
+        self.standardize_ballots(ballots, ballot_notation)
+        self.candidate_list = sorted(self.candidates, key=repr)
+        self.candidate_index = index = dict((candidate, i) for i, candidate in enumerate(self.candidate_list))
+
+        # Merge identical ballots
+        counts = {}
+        for ballot in self.ballots:
+            ranking = tuple(sorted((index[candidate], rating) for candidate, rating in ballot["ballot"].items()))
+            counts[ranking] = counts.get(ranking, 0) + ballot.get("count", 1)
+        self.rankings = list(counts.keys())
+        self.counts = list(counts.values())
+        self.ballots = [
+            {"count": count, "ballot": SparseBallot(
+                [(self.candidate_list[i], rating) for i, rating in ranking],
+                min(rating for i, rating in ranking) - 1,
+            )}
+            for ranking, count in zip(self.rankings, self.counts)
+        ]
+
+        # Tally the pairwise preferences and the (possibly shared) first preferences
+        self.pairwise = self.pairwise_tally(self.candidate_list, self.ballots)
+        self.first_preferences = dict.fromkeys(self.candidate_list, 0)
+        for ranking, count in zip(self.rankings, self.counts):
+            top = max(rating for i, rating in ranking)
+            for i, rating in ranking:
+                if rating == top:
+                    self.first_preferences[self.candidate_list[i]] += count
+
+    def pairs(self):
+        return dict([
+            ((self.candidate_list[i], self.candidate_list[j]), self.pairwise[i][j])
+            for i, j in itertools.permutations(range(len(self.candidate_list)), 2)
+        ])
+
+    def graph(self):
+        graph = digraph()
+        graph.add_nodes(self.candidate_list)
+        for pair, weight in self.pairs().items():
+            graph.add_edge(pair, weight)
+        return graph
+
+
 # This class determines the Condorcet winner if one exists.
 
 
 class CondorcetSystem(SingleWinnerVotingSystem, CondorcetHelper, metaclass=ABCMeta):
 
     @abstractmethod
-    def __init__(self, ballots, tie_breaker=None, ballot_notation=None):
+    def __init__(self, ballots, tie_breaker=None, ballot_notation=None, diagnostics=True):
+        self.diagnostics = diagnostics
         self.standardize_ballots(ballots, ballot_notation)
         super(CondorcetSystem, self).__init__(self.ballots, tie_breaker=tie_breaker)
 
     def calculate_results(self):
-        self.graph = self.ballots_into_graph(self.candidates, self.ballots)
+
+        # Without diagnostics, the pairwise graph is only needed if there is
+        # no Condorcet winner
+        if not self.diagnostics:
+            winner = self.condorcet_winner()
+            if winner is not None:
+                self.winner = winner
+                return
+
+        self.graph = self.pairwise_graph()
         self.pairs = self.edge_weights(self.graph)
         self.remove_weak_edges(self.graph)
         self.strong_pairs = self.edge_weights(self.graph)
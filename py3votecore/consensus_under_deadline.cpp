@@ -1,9 +1,4 @@
-#include <vector>
-#include <map>
-#include <algorithm>
-#include <string>
-
-using namespace std;
+#include "consensus_under_deadline.h"
 
 map<string, int> votesCalculate(map<int, string> ballots)
 {
@@ -23,4 +18,122 @@ vector<string> possibleWinners(const map<int, string> currentVotes, const int re
             ans.push_back(p.first);
         } });
     return ans;
-}
\ No newline at end of file
+}
+
+// Runs every round of the algorithm, voter selection and ballot changes included, in a single call.
+// Voters are selected by chooseVoter when given, otherwise the smallest voter's number is selected.
+// The scores, and the voters holding each ballot, are updated as ballots change rather than recounted.
+ConsensusResult consensusUnderDeadline(const vector<int> &voters, const vector<int> &votersType,
+                                       const vector<vector<string>> &votersPreferences, const string &defaultAlternative,
+                                       int remainingRounds, function<int(vector<int>)> chooseVoter,
+                                       const bool trace)
+{
+    ConsensusResult result;
+    result.winner = defaultAlternative;
+    const int unanimously = voters.size();
+    map<string, int> scores;
+    map<string, set<int>> holders;
+    unordered_map<int, size_t> voterIndex;
+    // the smallest active voter's number, if there's an active voter
+    optional<int> firstActive;
+    for (size_t i = 0; i < voters.size(); i++)
+    {
+        voterIndex[voters[i]] = i;
+        result.ballots.push_back(votersPreferences[i].empty() ? string() : votersPreferences[i][0]);
+        scores[result.ballots[i]]++;
+        holders[result.ballots[i]].insert(voters[i]);
+        if (votersType[i] == 1)
+        {
+            firstActive = firstActive ? min(*firstActive, voters[i]) : voters[i];
+        }
+    }
+    while (remainingRounds >= 0)
+    {
+        remainingRounds--;
+        result.remainingRounds = remainingRounds;
+        vector<string> possible;
+        for (const auto &p : scores)
+        {
+            if (p.second == unanimously)
+            {
+                result.winner = p.first;
+                return result;
+            }
+            if (p.second + remainingRounds + 1 >= unanimously)
+            {
+                possible.push_back(p.first);
+            }
+        }
+        // if no alternative is eligible to win - no need to keep iterating
+        if (possible.size() == 1 && possible[0] == defaultAlternative)
+        {
+            break;
+        }
+        // if only one option is valid
+        else if (possible.size() == 1)
+        {
+            result.winner = possible[0];
+            return result;
+        }
+        // candidate voters are the active ones, and those whose ballot isn't eligible to win
+        optional<int> voter;
+        if (chooseVoter)
+        {
+            vector<int> candidates;
+            for (size_t i = 0; i < voters.size(); i++)
+            {
+                if (votersType[i] == 1 || !binary_search(possible.begin(), possible.end(), result.ballots[i]))
+                {
+                    candidates.push_back(voters[i]);
+                }
+            }
+            if (!candidates.empty())
+            {
+                voter = chooseVoter(candidates);
+            }
+        }
+        else
+        {
+            voter = firstActive;
+            for (const auto &p : holders)
+            {
+                if (!p.second.empty() && !binary_search(possible.begin(), possible.end(), p.first))
+                {
+                    voter = voter ? min(*voter, *p.second.begin()) : *p.second.begin();
+                }
+            }
+        }
+        if (!voter)
+        {
+            continue;
+        }
+        const auto found = voterIndex.find(*voter);
+        if (found == voterIndex.end())
+        {
+            throw out_of_range("voter doesn't exist");
+        }
+        string &ballot = result.ballots[found->second];
+        // voter chooses to change his ballot to the top possible alternative (besides his current)
+        for (const auto &preference : votersPreferences[found->second])
+        {
+            if (preference != ballot && binary_search(possible.begin(), possible.end(), preference))
+            {
+                if (trace)
+                {
+                    result.trace.push_back({remainingRounds, *voter, ballot, preference, possible});
+                }
+                if (--scores[ballot] == 0)
+                {
+                    scores.erase(ballot);
+                }
+                scores[preference]++;
+                holders[ballot].erase(*voter);
+                holders[preference].insert(*voter);
+                ballot = preference;
+                break;
+            }
+        }
+    }
+    result.remainingRounds = remainingRounds;
+    return result;
+}
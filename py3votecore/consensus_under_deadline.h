@@ -0,0 +1,42 @@
+#ifndef CONSENSUS_UNDER_DEADLINE_H
+#define CONSENSUS_UNDER_DEADLINE_H
+
+#include <vector>
+#include <map>
+#include <unordered_map>
+#include <algorithm>
+#include <string>
+#include <functional>
+#include <stdexcept>
+#include <set>
+#include <optional>
+
+using namespace std;
+
+struct ConsensusEvent
+{
+    int remainingRounds;
+    int voter;
+    string oldBallot;
+    string newBallot;
+    vector<string> possibleWinners;
+};
+
+struct ConsensusResult
+{
+    string winner;
+    int remainingRounds;
+    vector<string> ballots;
+    vector<ConsensusEvent> trace;
+};
+
+map<string, int> votesCalculate(map<int, string> ballots);
+
+vector<string> possibleWinners(const map<int, string> currentVotes, const int remainingRounds, const int unanimously);
+
+ConsensusResult consensusUnderDeadline(const vector<int> &voters, const vector<int> &votersType,
+                                       const vector<vector<string>> &votersPreferences, const string &defaultAlternative,
+                                       int remainingRounds, function<int(vector<int>)> chooseVoter,
+                                       const bool trace);
+
+#endif
@@ -1,18 +1,101 @@
+import copy
 import doctest
+import hashlib
+import os
 import random
 import logging
-from collections import Counter
-import cppyy
-from cppyy.gbl import std
+import statistics
+import subprocess
+from array import array
+from bisect import bisect_left
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the C++ kernels are loaded by cppyy on first use, and the pure-Python methods are used when cppyy is missing
+BACKEND_NATIVE = 'native'
+BACKEND_PYTHON = 'python'
+BACKEND_NUMPY = 'numpy'
+# the reasons deploy_algorithm can decide the outcome without running the rounds
+SHORTCUT_UNANIMOUS = 'unanimous'
+SHORTCUT_NO_POSSIBLE_WINNER = 'no possible winner'
+SHORTCUT_SINGLE_POSSIBLE_WINNER = 'single possible winner'
+NATIVE_HEADER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'consensus_under_deadline.h')
+NATIVE_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'consensus_under_deadline.cpp')
+# the kernels are compiled once into a shared library here, and reused by every later process
+NATIVE_CACHE = os.environ.get('PY3VOTECORE_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'py3votecore'))
+native_module = None
+
+logger = logging.getLogger(__name__)
+
+# a ballot change during the rounds, with the rounds left and the alternatives who were possible to win at the time
+ConsensusEvent = namedtuple('ConsensusEvent', ['remaining_rounds', 'voter', 'old_ballot', 'new_ballot', 'possible_winners'])
+
+
+def build_native(cache_dir: str = None) -> str:
+    '''
+        Compiles the C++ kernels into a shared library, unless the cache already has one built from the same sources.
 
-cppyy.include("consensus_under_deadline.cpp")
+        Arguments:
+            cache_dir - where the library is kept. If None - NATIVE_CACHE
 
+        Returns:
+            The path of the library, or None if it couldn't be built
+    '''
+    cache_dir = cache_dir or NATIVE_CACHE
+    digest = hashlib.sha256()
+    for path in (NATIVE_HEADER, NATIVE_SOURCE):
+        with open(path, 'rb') as source:
+            digest.update(source.read())
+    library = os.path.join(cache_dir, f'''consensus_under_deadline-{digest.hexdigest()[:16]}.so''')
+    if os.path.exists(library):
+        return library
+    # build under a temporary name, so concurrent processes never load a partial library
+    partial = f'''{library}.{os.getpid()}'''
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        subprocess.run([os.environ.get('CXX', 'c++'), '-std=c++17', '-O2', '-shared', '-fPIC',
+                        '-o', partial, NATIVE_SOURCE], check=True, capture_output=True)
+        os.replace(partial, library)
+    except (OSError, subprocess.CalledProcessError) as error:
+        logger.warning('could not build the consensus kernels library: %s', error)
+        if os.path.exists(partial):
+            os.remove(partial)
+        return None
+    return library
+
+
+def load_native():
+    '''
+        Imports cppyy and loads the C++ kernels, once per process. The prebuilt library from build_native is used when
+        possible, otherwise cppyy compiles the source itself.
+
+        Returns:
+            The cppyy module, or None if cppyy isn't available
+    '''
+    global native_module
+    if native_module is None:
+        try:
+            import cppyy
+        except ImportError:
+            native_module = False
+        else:
+            library = build_native()
+            if library is not None:
+                cppyy.include(NATIVE_HEADER)
+                cppyy.load_library(library)
+            else:
+                cppyy.include(NATIVE_SOURCE)
+            native_module = cppyy
+    return native_module or None
 
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger()
 
 def mdvr(voters: tuple, voters_type: tuple, alternatives: tuple, voters_preferences: list,
-         default_alternative: str, remaining_rounds: int, random_selection: bool):
+         default_alternative: str, remaining_rounds: int, random_selection: bool, backend: str = None, trace=None):
     '''
     Runs the algorithm 'Consensus Under Deadline' to determine the winning result.
 
@@ -56,7 +139,7 @@ def mdvr(voters: tuple, voters_type: tuple, alternatives: tuple, voters_preferen
     null
 '''
     cud = ConsensusUnderDeadline(voters, voters_type, alternatives, voters_preferences,
-                                 default_alternative, remaining_rounds, random_selection)
+                                 default_alternative, remaining_rounds, random_selection, backend, trace)
     return cud.deploy_algorithm()
 
 
@@ -71,7 +154,8 @@ class ConsensusUnderDeadline():
     '''
 
     def __init__(self, voters: tuple, voters_type: tuple, alternatives: tuple, voters_preferences: list,
-                 default_alternative: str, remaining_rounds: int, random_selection: bool) -> int:
+                 default_alternative: str, remaining_rounds: int, random_selection: bool, backend: str = None,
+                 trace=None) -> int:
         '''
             Constructor for Consensus-Under-Deadline algorithm.
 
@@ -83,9 +167,13 @@ class ConsensusUnderDeadline():
                 default_alternative - an alternative that will be chosen upon disagreement
                 remaining_rounds - a threshold for the amount if rounds left until decision should be taken
                 random_selection - whether the selection of voter for changing their ballot. If False - the smallest voter's number will be selected
+                backend - 'native' to run the rounds in C++, 'python' to run them in Python, 'numpy' to run them on NumPy arrays.
+                          If None - native when cppyy is available
+                trace - called with a ConsensusEvent for each ballot change during deploy_algorithm. If None - nothing is traced
         '''
-        logger.info('ConsensusUnderDeadline object created')
-        if len(tuple(set(voters))) != len(voters):
+        # the position of each voter, in voters_type and voters_preferences
+        self.voter_index = {voter: i for i, voter in enumerate(voters)}
+        if len(self.voter_index) != len(voters):
             raise ValueError('each voter must have unique id')
         self.voters = voters
         flag = False
@@ -93,20 +181,65 @@ class ConsensusUnderDeadline():
         if flag:
             raise TypeError('voter type can only be presented with 1 or 0')
         self.voters_type = voters_type
-        if len(tuple(set(alternatives))) != len(alternatives):
+        # the index of each alternative, followed by anything else found in the preferences
+        self.alternative_index = {alter: i for i, alter in enumerate(alternatives)}
+        if len(self.alternative_index) != len(alternatives):
             raise ValueError('each alternative must have unique id')
         if len(voters) != len(voters_preferences):
             raise TypeError('length of voters and preference must be the same')
         self.alternatives = alternatives
         self.voters_preferences = voters_preferences
         self.default_alternative = default_alternative
+        self.index_preferences()
         # initiate first ballot for each voter by their top preference
-        self.voters_current_ballot = {i + 1: voters_preferences[i][0]
-                                      for i in range(len(voters_preferences))}
+        self.voters_current_ballot = {voter: voters_preferences[i][0]
+                                      for voter, i in self.voter_index.items()}
         if remaining_rounds < 0:
             raise ValueError(f'''time can't be negative''')
         self.remaining_rounds = remaining_rounds
         self.random_selection = random_selection
+        # the random generator of a single trial, the module's one when None
+        self.rng = None
+        if backend not in (None, BACKEND_NATIVE, BACKEND_PYTHON, BACKEND_NUMPY):
+            raise ValueError(f'''unknown backend {backend}''')
+        self.backend = backend
+        self.trace = trace
+        # the reason the last deploy_algorithm decided the outcome without running the rounds, if it did
+        self.shortcut = None
+        self.tally_votes()
+
+    def index_preferences(self):
+        '''
+            Ranks the alternatives in each voter's preferences, into a flat voter by alternative array of ranks. An alternative
+            missing from a voter's preferences is ranked past the last one.
+
+            ---------------------------------TESTS---------------------------------
+            >>> v = (7, 3)
+            >>> v_type = (1, 0)
+            >>> alters = ('a', 'b', 'c')
+            >>> df_alter = 'null'
+            >>> vp =[['b', 'a'], ['c', 'a', 'b']]
+            >>> cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=2, random_selection=False)
+            >>> print(cud.voters_ranks.tolist())
+            [1, 0, 3, 1, 2, 0]
+        '''
+        for voter_preferences in self.voters_preferences:
+            for alter in voter_preferences:
+                if alter not in self.alternative_index:
+                    self.alternative_index[alter] = len(self.alternative_index)
+        unranked = len(self.alternative_index)
+        self.voters_ranks = array('i', [unranked]) * (len(self.voters_preferences) * unranked)
+        for voter_index, voter_preferences in enumerate(self.voters_preferences):
+            offset = voter_index * unranked
+            # the first time an alternative is listed counts
+            for position in range(len(voter_preferences) - 1, -1, -1):
+                self.voters_ranks[offset + self.alternative_index[voter_preferences[position]]] = position
+
+    def is_alternative(self, alter: str) -> bool:
+        '''
+            Whether an alternative is one of the optional choices, rather than only found in preferences.
+        '''
+        return self.alternative_index.get(alter, len(self.alternatives)) < len(self.alternatives)
 
     def deploy_algorithm(self):
         '''
@@ -154,62 +287,395 @@ class ConsensusUnderDeadline():
             >>> print(cud.deploy_algorithm())
             null
         '''
-        logger.info('deploying algorithm')
+        self.shortcut = None
+        outcome = self.closed_form_outcome()
+        if outcome is not None:
+            winner, self.remaining_rounds, self.shortcut = outcome
+            return winner
+        if self.backend == BACKEND_NUMPY:
+            if numpy is None:
+                raise ImportError('the numpy backend requires numpy')
+            return self.deploy_numpy()
+        native = None if self.backend == BACKEND_PYTHON else load_native()
+        if native is not None:
+            return self.deploy_native(native)
+        if self.backend == BACKEND_NATIVE:
+            raise ImportError('the native backend requires cppyy')
+        return self.deploy_python()
+
+    def closed_form_outcome(self):
+        '''
+            Decides the outcome from the current vote counts and deadline, when no round can change it - an alternative
+            already has every vote, none of the alternatives voted for can reach every vote in time, or only one can.
+
+            Returns:
+                A tuple of the winner, the rounds left when the algorithm stops and the reason, or None if the rounds have to be run
+
+            ---------------------------------TESTS---------------------------------
+            >>> v = (1, 2, 3, 4, 5)
+            >>> v_type = (0, 0, 0, 0, 0)
+            >>> alters = ('a', 'b', 'c', 'd')
+            >>> df_alter = 'null'
+            >>> vp =[['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['b', 'c', 'a', 'd'], ['b', 'a', 'c', 'd'], ['c', 'b', 'd', 'a']]
+            >>> cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=2, random_selection=False)
+            >>> print(cud.closed_form_outcome())
+            ('null', -1, 'no possible winner')
+
+            >>> cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=4, random_selection=False)
+            >>> print(cud.closed_form_outcome())
+            None
+        '''
         # the required score for an alternative to win
         unanimously = len(self.voters)
-        logger.debug('required votes for unanimously: %g', unanimously)
-        logger.debug('round number: %g', self.remaining_rounds)
+        if unanimously > 0 and self.scores_alternatives.get(unanimously):
+            winner, = self.scores_alternatives[unanimously]
+            return winner, self.remaining_rounds - 1, SHORTCUT_UNANIMOUS
+        # the alternatives voted for who are possible to win after the first round
+        possible_winners = [alter for alter, score in self.votes_score.items()
+                            if score > 0 and score + self.remaining_rounds >= unanimously]
+        if len(possible_winners) == 1:
+            # the only one wins, or the rounds stop there when it's the default alternative
+            return possible_winners[0], self.remaining_rounds - 1, SHORTCUT_SINGLE_POSSIBLE_WINNER
+        if len(possible_winners) == 0:
+            # nobody can change to an alternative who's possible to win, until the rounds are over
+            return self.default_alternative, -1, SHORTCUT_NO_POSSIBLE_WINNER
+        return None
+
+    def deploy_native(self, native):
+        '''
+            Runs every round inside a single call to the C++ kernels, random selection calls back for the chosen voter.
+
+            Arguments:
+                native - the cppyy module the kernels were compiled with
+
+            Returns:
+                The winner alternative
+        '''
+        alternatives_order = dict(self.alternatives_order)
+        std = native.gbl.std
+        preferences = std.vector[std.vector[std.string]]()
+        for voter_preferences in self.voters_preferences:
+            preferences.push_back(std.vector[std.string](voter_preferences))
+        result = native.gbl.consensusUnderDeadline(
+            std.vector[int](self.voters), std.vector[int](self.voters_type), preferences,
+            self.default_alternative, self.remaining_rounds,
+            self.choose_random_voter if self.random_selection else native.nullptr,
+            self.trace is not None)
+        # the kernels record the ballot changes, which are passed on once they return
+        for event in result.trace:
+            self.trace(ConsensusEvent(event.remainingRounds, event.voter, str(event.oldBallot), str(event.newBallot),
+                                      tuple(sorted(map(str, event.possibleWinners), key=alternatives_order.get))))
+        self.remaining_rounds = result.remainingRounds
+        self.voters_current_ballot = {voter: str(ballot)
+                                      for voter, ballot in zip(self.voters, result.ballots)}
+        self.tally_votes()
+        return str(result.winner)
+
+    def deploy_python(self):
+        '''
+            Runs the rounds in Python, on the counts kept by change_vote and possible_winners.
+
+            Returns:
+                The winner alternative
+        '''
         while self.remaining_rounds >= 0:
-            logger.debug('voters have cast their ballots')
             self.round_passed()  # mark this round as passed
+            winner = self.play_round()
+            if winner is not None:
+                return winner
+        # if unanimously hasn't reached - return default alternative
+        return self.default_alternative
+
+    def play_round(self):
+        '''
+            Plays the round just marked as passed - a voter changes their ballot, unless the outcome is already decided.
+
+            Returns:
+                The winner alternative if the rounds stop here, otherwise None
+        '''
+        winner, change, possible_winners = self.decide_round()
+        if change is not None:
+            ballot_change_voter, preference, voter_current_ballot = change
+            self.change_vote(ballot_change_voter, preference, voter_current_ballot)
+            if self.trace is not None:
+                self.trace(ConsensusEvent(self.remaining_rounds, ballot_change_voter, voter_current_ballot,
+                                          preference, tuple(possible_winners)))
+        return winner
+
+    def decide_round(self):
+        '''
+            Decides the round just marked as passed, without changing any ballot.
+
+            Returns:
+                A tuple of the winner alternative if the rounds stop here, the voter, new and current ballot of the change
+                to make if there's one, and the possible winners
+        '''
+        # the required score for an alternative to win
+        unanimously = len(self.voters)
+        for alter in self.scores_alternatives.get(unanimously, ()):
+            if unanimously > 0:
+                return alter, None, [alter]
+        # all the alternative who's possible to be elected, among those voted for - none of them doesn't make the
+        # default alternative one, the rounds go on until the deadline
+        self.update_possible_alternatives()
+        possible_winners = [alter for alter in sorted(self.possible_alternatives, key=self.alternatives_order.get)
+                            if self.votes_score.get(alter, 0) > 0]
+        # if only the default alternative is eligible to win - no need to keep iterating
+        if possible_winners == [self.default_alternative]:
+            return self.default_alternative, None, possible_winners
+        # if only one option is valid
+        elif len(possible_winners) == 1:
+            return possible_winners[0], None, possible_winners
+        voters_candidate = []  # candidate voters to change their ballot
+        # select voters to change their ballot base on their type and selected alternative
+        for voter_index, voter in enumerate(self.voters):
+            # if voter's current vote isn't eligible to win, or voter is active and has more winners candidate alternatives to vote for
+            if self.voters_current_ballot.get(voter) not in possible_winners or self.voters_type[voter_index] == 1:
+                voters_candidate.append(voter)
+        if len(voters_candidate) != 0:
+            ballot_change_voter = self.choose_random_voter(
+                voters_candidate)
+            ballot_change_voter_preference = self.voters_preferences[self.voter_index[ballot_change_voter]]
+            voter_current_ballot = self.voters_current_ballot[ballot_change_voter]
+            # voter chooses to change his ballot to the top possible alternative (besides his current)
+            for preference in ballot_change_voter_preference:
+                if preference in possible_winners and preference != voter_current_ballot:
+                    return None, (ballot_change_voter, preference, voter_current_ballot), possible_winners
+        return None, None, possible_winners
+
+    def deploy_numpy(self):
+        '''
+            Runs the rounds on arrays - a voter by alternative rank matrix, and ballot, type and vote count vectors.
+            The voters who may change their ballot, and their top possible alternative, are found with masks over them.
 
-            # cppyy function call
-            currentVotesMap = std.map[int, str]()
-            for voter, ballot in self.voters_current_ballot.items():
-                currentVotesMap[voter] = ballot
-            current_votes_score = dict(
-                cppyy.gbl.votesCalculate(currentVotesMap))
-            for key, value in current_votes_score.items():
-                if value == unanimously:
-                    return key
-            # all the alternative who's possible to be elected
-            possible_winners = list(cppyy.gbl.possibleWinners(
-                currentVotesMap, self.remaining_rounds, unanimously))
-            logger.debug('round number: %g', self.remaining_rounds)
+            Returns:
+                The winner alternative
+        '''
+        alternatives = list(self.alternative_index)
+        unranked = len(alternatives)
+        ranks = numpy.frombuffer(self.voters_ranks, dtype=numpy.intc).reshape(len(self.voters), unranked)
+        voters = numpy.array(tuple(self.voters), dtype=numpy.intp)
+        active = numpy.array(tuple(self.voters_type), dtype=numpy.intp) == 1
+        ballots = numpy.array([self.alternative_index[self.voters_current_ballot[voter]] for voter in self.voters],
+                              dtype=numpy.intp)
+        scores = numpy.bincount(ballots, minlength=len(alternatives))
+        # the required score for an alternative to win
+        unanimously = len(self.voters)
+        winner = self.default_alternative
+        while self.remaining_rounds >= 0:
+            self.round_passed()  # mark this round as passed
+            if unanimously > 0 and scores.max() == unanimously:
+                winner = alternatives[int(scores.argmax())]
+                break
+            # all the alternative who's possible to be elected, among those voted for
+            possible = (scores > 0) & (scores + self.remaining_rounds + 1 >= unanimously)
+            possible_winners = numpy.flatnonzero(possible)
             # if no alternative is eligible to win - no need to keep iterating
-            if possible_winners == [self.default_alternative]:
-                logger.debug(
-                    'possible winners: %s. Algorithm is finished with no winner', self.default_alternative)
+            if len(possible_winners) == 1 and alternatives[possible_winners[0]] == self.default_alternative:
                 break
             # if only one option is valid
             elif len(possible_winners) == 1:
-                return possible_winners[0]
-            voters_candidate = []  # candidate voters to change their ballot
-            # select voters to change their ballot base on their type and selected alternative
-            for voter_index in range(len(self.voters)):
-                voter = self.voters[voter_index]
-                voter_type = self.voters_type[voter_index]
-                # if voter's current vote isn't eligible to win - mark him as wishes to change ballot
-                if self.voters_current_ballot.get(voter_index + 1) not in possible_winners:
-                    voters_candidate.append(voter)
-                    logger.debug('voter %g wishes to change his ballot', voter)
-                # if voter is active and he has more winners candidate alternatives to vote for
-                elif voter_type == 1 and len(possible_winners) != 1:
-                    voters_candidate.append(voter)
-                    logger.debug('voter %g wishes to change his ballot', voter)
+                winner = alternatives[possible_winners[0]]
+                break
+            # voters whose current vote isn't eligible to win, or active voters
+            voters_candidate = voters[~possible[ballots] | active]
             if len(voters_candidate) != 0:
-                ballot_change_voter = self.choose_random_voter(
-                    voters_candidate)
-                ballot_change_voter_preference = self.voters_preferences[ballot_change_voter - 1]
-                voter_current_ballot = self.voters_current_ballot[ballot_change_voter]
+                if self.random_selection:
+                    ballot_change_voter = int(self.choose_random_voter(voters_candidate))
+                else:
+                    ballot_change_voter = int(voters_candidate.min())
+                voter_index = self.voter_index[ballot_change_voter]
+                current_ballot = ballots[voter_index]
                 # voter chooses to change his ballot to the top possible alternative (besides his current)
-                for preference in ballot_change_voter_preference:
-                    if preference in possible_winners and preference != voter_current_ballot:
-                        self.change_vote(
-                            ballot_change_voter, preference, voter_current_ballot)
-                        break
-        # if unanimously hasn't reached - return default alternative
-        return self.default_alternative
+                rank = numpy.where(possible, ranks[voter_index], unranked)
+                rank[current_ballot] = unranked
+                new_ballot = int(rank.argmin())
+                if rank[new_ballot] != unranked:
+                    scores[current_ballot] -= 1
+                    scores[new_ballot] += 1
+                    ballots[voter_index] = new_ballot
+                    if self.trace is not None:
+                        self.trace(ConsensusEvent(self.remaining_rounds, ballot_change_voter, alternatives[current_ballot],
+                                                  alternatives[new_ballot], tuple(sorted(
+                                                      (alternatives[i] for i in possible_winners), key=self.alternatives_order.get))))
+        self.voters_current_ballot = {voter: alternatives[ballot]
+                                      for voter, ballot in zip(self.voters, ballots.tolist())}
+        self.tally_votes()
+        return winner
+
+    def simulate(self, n_trials: int, seed: int = None, workers: int = 1) -> dict:
+        '''
+            Runs the algorithm repeatedly from the current ballots, each trial with its own seed for the random voter selection.
+            The trials' seeds are drawn from the given seed, so the results don't depend on the number of workers.
+            The trials aren't traced.
+
+            Arguments:
+                n_trials - the number of independent trials
+                seed - the seed the trials' seeds are drawn from. If None - the trials aren't reproducible
+                workers - the number of processes to run the trials in. If None - one per CPU
+
+            Returns:
+                A dictionary of the winners' frequencies, the default alternative's frequency and statistics of the rounds used
+
+            ---------------------------------TESTS---------------------------------
+            >>> v = (1, 2, 3, 4, 5)
+            >>> v_type = (1, 1, 1, 1, 0)
+            >>> alters = ('a', 'b', 'c', 'd')
+            >>> df_alter = 'null'
+            >>> vp =[['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['b', 'c', 'a', 'd'], ['b', 'a', 'c', 'd'], ['c', 'b', 'd', 'a']]
+            >>> t = 4
+            >>> cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=t, random_selection=False)
+            >>> print(cud.simulate(10, seed=1))
+            {'trials': 10, 'winners': {'b': 1.0}, 'default_frequency': 0.0, 'rounds': {'mean': 2, 'stdev': 0.0, 'min': 2, 'max': 2}}
+        '''
+        if n_trials < 1:
+            raise ValueError(f'''number of trials must be positive''')
+        seeds_generator = random.Random(seed)
+        seeds = [seeds_generator.getrandbits(64) for _ in range(n_trials)]
+        simulation = copy.copy(self)
+        simulation.trace = None
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            results = simulation.run_trials(seeds)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # a chunk of trials per task, so the object is sent to each worker only a few times
+                chunk = -(-n_trials // (workers * 4))
+                results = [result for chunk_results in executor.map(
+                    simulation.run_trials, [seeds[i:i + chunk] for i in range(0, n_trials, chunk)])
+                    for result in chunk_results]
+        winners = Counter(winner for winner, _ in results)
+        rounds = [rounds for _, rounds in results]
+        return {'trials': n_trials,
+                'winners': {winner: count / n_trials for winner, count in winners.most_common()},
+                'default_frequency': winners[self.default_alternative] / n_trials,
+                'rounds': {'mean': statistics.mean(rounds), 'stdev': statistics.pstdev(rounds),
+                           'min': min(rounds), 'max': max(rounds)}}
+
+    def run_trials(self, seeds: list) -> list:
+        '''
+            Runs a trial of the algorithm for each seed, on copies of this object so its state isn't changed.
+
+            Arguments:
+                seeds - a seed for the random voter selection of each trial
+
+            Returns:
+                A list of the winner and the number of rounds used, for each trial
+        '''
+        results = []
+        for seed in seeds:
+            trial = self.branch()
+            trial.rng = random.Random(seed)
+            winner = trial.deploy_algorithm()
+            results.append((winner, self.remaining_rounds - trial.remaining_rounds))
+        return results
+
+    def branch(self):
+        '''
+            Returns an untraced copy of this object, whose ballots can change without changing this one's.
+        '''
+        run = copy.copy(self)
+        run.trace = None
+        run.voters_current_ballot = dict(self.voters_current_ballot)
+        run.tally_votes()
+        return run
+
+    def sweep(self, max_deadline: int) -> dict:
+        '''
+            Finds the winner for every deadline from 0 to max_deadline remaining rounds, starting from the current ballots.
+            The deadlines share a single run of the rounds for as long as the same alternatives are possible to win under
+            each of them, and the run is only branched where they differ.
+
+            Arguments:
+                max_deadline - the largest number of remaining rounds to find the winner for
+
+            Returns:
+                A dictionary of the winner for each deadline
+
+            ---------------------------------TESTS---------------------------------
+            >>> v = (1, 2, 3, 4, 5)
+            >>> v_type = (1, 1, 1, 1, 0)
+            >>> alters = ('a', 'b', 'c', 'd')
+            >>> df_alter = 'null'
+            >>> vp =[['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['b', 'c', 'a', 'd'], ['b', 'a', 'c', 'd'], ['c', 'b', 'd', 'a']]
+            >>> cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=0, random_selection=False)
+            >>> print(cud.sweep(5))
+            {0: 'null', 1: 'null', 2: 'null', 3: 'b', 4: 'b', 5: 'b'}
+        '''
+        if self.random_selection:
+            raise ValueError(f'''a sweep requires the smallest voter's number to be selected''')
+        if max_deadline < 0:
+            raise ValueError(f'''time can't be negative''')
+        winners = {}
+        # the runs still going, each with the deadlines sharing it in increasing order
+        runs = [(self.branch(), list(range(max_deadline + 1)))]
+        rounds = 0
+        while runs:
+            rounds += 1
+            next_runs = []
+            for run, deadlines in runs:
+                # the deadlines following each ballot change, in the order the changes are found
+                changes = {}
+                for group in run.split_deadlines(deadlines, rounds):
+                    run.remaining_rounds = group[0] - rounds + 1
+                    # the deadlines in a group agree on the alternatives possible to win, and so on a closed form outcome
+                    outcome = run.closed_form_outcome()
+                    if outcome is not None:
+                        winners.update(dict.fromkeys(group, outcome[0]))
+                        continue
+                    run.round_passed()  # mark this round as passed
+                    winner, change, _ = run.decide_round()
+                    if winner is not None:
+                        winners.update(dict.fromkeys(group, winner))
+                    else:
+                        changes.setdefault(change, []).extend(group)
+                # the run is only branched for deadlines whose ballots change differently
+                branches = [run if i == 0 else run.branch() for i in range(len(changes))]
+                for branch, (change, group) in zip(branches, changes.items()):
+                    if change is not None:
+                        branch.change_vote(*change)
+                    group.sort()
+                    # the shortest deadline has no rounds left
+                    if group[0] - rounds < 0:
+                        winners[group.pop(0)] = self.default_alternative
+                    if group:
+                        next_runs.append((branch, group))
+            runs = next_runs
+        return dict(sorted(winners.items()))
+
+    def split_deadlines(self, deadlines: list, rounds: int) -> list:
+        '''
+            Groups the deadlines sharing this run by the alternatives possible to win under each of them in the coming round.
+
+            Arguments:
+                deadlines - the deadlines sharing this run, in increasing order
+                rounds - the number of the coming round
+
+            Returns:
+                A list of the deadlines in each group, in increasing order
+        '''
+        unanimously = len(self.voters)
+        # alternatives with a score are possible to win under the deadlines from its cut onwards
+        cuts = sorted({unanimously - score - 1 + rounds for score in self.votes_score.values()})
+        groups = []
+        start = 0
+        for end in [bisect_left(deadlines, cut) for cut in cuts] + [len(deadlines)]:
+            if end <= start:
+                continue
+            possible_winners = self.possible_winners_at(deadlines[start] - rounds)
+            if groups and groups[-1][0] == possible_winners:
+                groups[-1][1].extend(deadlines[start:end])
+            else:
+                groups.append((possible_winners, deadlines[start:end]))
+            start = end
+        return [group for _, group in groups]
+
+    def possible_winners_at(self, remaining_rounds: int) -> set:
+        '''
+            Returns the alternatives voted for who are possible to win with the given remaining rounds, as play_round finds them.
+        '''
+        unanimously = len(self.voters)
+        return {alter for alter, score in self.votes_score.items() if score > 0 and score + remaining_rounds + 1 >= unanimously}
 
     def round_passed(self):
         '''
@@ -272,29 +738,89 @@ class ConsensusUnderDeadline():
             >>> print(cud.possible_winners())
             ['b']
         '''
-        logger.info('calculating possible winners alternatives')
-        unanimously = len(
-            self.voters)  # the amount of votes needed to reach consensus
-        current_votes_score = ConsensusUnderDeadline.votes_calculate(
-            self.voters_current_ballot)
-        # add all alternatives who haven't been voted for - cover the case where alternative with 0 votes can still be a winner
-        for alter in self.alternatives:
-            if alter not in current_votes_score:
-                current_votes_score[alter] = 0
-        possible_winners_alters = []
-        logger.debug('total votes: %g', unanimously)
-        logger.debug('current vote scores: %s', current_votes_score)
-        for alt, score in current_votes_score.items():
-            # if an alternative has a chance to get the remaining votes in the remaining time
-            if (score + self.remaining_rounds + 1) >= unanimously:
-                possible_winners_alters.append(alt)
-                logger.debug(
-                    'alternative %s nominate as a winner candidate', alt)
+        self.update_possible_alternatives()
         # if none of the alternatives has a chance to be chosen - return default alternative
-        if len(possible_winners_alters) == 0:
+        if len(self.possible_alternatives) == 0:
             return [self.default_alternative]
-        logger.debug('possible winners: %s', possible_winners_alters)
-        return possible_winners_alters
+        return sorted(self.possible_alternatives, key=self.alternatives_order.get)
+
+    def update_possible_alternatives(self):
+        '''
+            Catches the alternatives who are possible to win up with the rounds passed since they were last updated.
+        '''
+        # catch up with the rounds passed since the possible winners were last updated
+        if abs(self.possible_rounds - self.remaining_rounds) > len(self.scores_alternatives):
+            self.tally_votes()
+        while self.possible_rounds > self.remaining_rounds:
+            self.possible_rounds -= 1
+            # alternatives at the previous threshold can no longer get the remaining votes in time
+            self.possible_alternatives -= self.scores_alternatives.get(
+                len(self.voters) - self.possible_rounds - 2, set())
+        while self.possible_rounds < self.remaining_rounds:
+            self.possible_rounds += 1
+            self.possible_alternatives |= self.scores_alternatives.get(
+                len(self.voters) - self.possible_rounds - 1, set())
+
+    def tally_votes(self):
+        '''
+            Count the current ballots, including the alternatives who haven't been voted for, and find the alternatives
+            who are possible to win. change_vote and possible_winners keep both up to date from then on.
+
+            ---------------------------------TESTS---------------------------------
+            >>> v = (1, 2, 3, 4, 5)
+            >>> v_type = (0, 0, 0, 0, 0)
+            >>> alters = ('a', 'b', 'c', 'd')
+            >>> df_alter = 'null'
+            >>> vp =[['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['b', 'c', 'a', 'd'], ['b', 'a', 'c', 'd'], ['c', 'b', 'd', 'a']]
+            >>> t = 3
+            >>> cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=t, random_selection=False)
+            >>> print(cud.votes_score)
+            {'a': 2, 'b': 2, 'c': 1, 'd': 0}
+
+            >>> cud.change_vote(5, 'b', 'c')
+            >>> print(cud.votes_score)
+            {'a': 2, 'b': 3, 'c': 0, 'd': 0}
+            >>> print(cud.possible_winners())
+            ['a', 'b']
+        '''
+        self.votes_score = ConsensusUnderDeadline.votes_calculate(self.voters_current_ballot)
+        # add all alternatives who haven't been voted for - cover the case where alternative with 0 votes can still be a winner
+        for alter in self.alternatives:
+            if alter not in self.votes_score:
+                self.votes_score[alter] = 0
+        self.alternatives_order = {alter: i for i, alter in enumerate(self.votes_score)}
+        # the alternatives holding each score
+        self.scores_alternatives = {}
+        for alter, score in self.votes_score.items():
+            self.scores_alternatives.setdefault(score, set()).add(alter)
+        # if an alternative has a chance to get the remaining votes in the remaining time
+        self.possible_rounds = self.remaining_rounds
+        self.possible_alternatives = {alter for alter, score in self.votes_score.items()
+                                      if score + self.possible_rounds + 1 >= len(self.voters)}
+
+    def add_score(self, alter: str, score: int):
+        '''
+            Add to an alternative's score, moving it between the scores and the possible winners as needed.
+
+            Arguments:
+                alter - the alternative whose score changes
+                score - the amount to add to its score
+        '''
+        current_score = self.votes_score.get(alter, 0)
+        self.scores_alternatives.get(current_score, set()).discard(alter)
+        current_score += score
+        self.votes_score[alter] = current_score
+        if current_score == 0 and not self.is_alternative(alter):
+            # an alternative nobody votes for only counts when it was offered
+            del self.votes_score[alter]
+            self.possible_alternatives.discard(alter)
+            return
+        self.scores_alternatives.setdefault(current_score, set()).add(alter)
+        self.alternatives_order.setdefault(alter, len(self.alternatives_order))
+        if current_score + self.possible_rounds + 1 >= len(self.voters):
+            self.possible_alternatives.add(alter)
+        else:
+            self.possible_alternatives.discard(alter)
 
     def change_vote(self, voter: int, new_vote: str, current_vote: str):
         '''
@@ -328,16 +854,18 @@ class ConsensusUnderDeadline():
             >>> print(cud.voters_current_ballot)
             {1: 'b', 2: 'b', 3: 'b', 4: 'd', 5: 'c'}
         '''
-        if voter not in self.voters:
+        if voter not in self.voter_index:
             raise ValueError(f'''voter doesn't exist''')
-        if new_vote not in self.alternatives or current_vote not in self.alternatives:
+        if not self.is_alternative(new_vote) or not self.is_alternative(current_vote):
             raise ValueError(f'''given alternative doesn't exist''')
         if new_vote == current_vote:
             raise ValueError(
                 f'''voter can't change his ballot to current one''')
+        previous_vote = self.voters_current_ballot.get(voter)
         self.voters_current_ballot[voter] = new_vote
-        logger.info('voter %s changed his vote from %s to %s',
-                    voter, current_vote, new_vote)
+        if previous_vote is not None:
+            self.add_score(previous_vote, -1)
+        self.add_score(new_vote, 1)
 
     def choose_random_voter(self, voters: list) -> int:
         '''
@@ -371,9 +899,7 @@ class ConsensusUnderDeadline():
             >>> print(cud.choose_random_voter(v))
             3
         '''
-        ans = random.choice(voters) if self.random_selection else min(voters)
-        logger.info('voter %s has been chosen for changing ballot', ans)
-        return ans
+        return (self.rng or random).choice(voters) if self.random_selection else min(voters)
 
     @staticmethod
     def votes_calculate(ballots: dict) -> dict:
@@ -1,24 +1,104 @@
-from .abstract_classes import AbstractSingleWinnerVotingSystem
-from .stv import STV
+# Copyright (C) 2009, Brad Beattie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from .abstract_classes import SingleWinnerVotingSystem
+from .common_functions import matching_keys
+from .stv import TransferableVoteHelper
 
-class IRV(AbstractSingleWinnerVotingSystem):
 
-    def __init__(self, ballots, tie_breaker=None):
-        super(IRV, self).__init__(ballots, STV, tie_breaker=tie_breaker)
+# This class implements Instant Runoff Voting (aka IRV) directly rather than
+# as a single seat STV count. Every round, all trailing candidates whose
+# combined tally cannot overtake the next-lowest candidate are eliminated
+# together, and the count stops as soon as a candidate holds a majority of
+# the continuing votes.
+class IRV(SingleWinnerVotingSystem, TransferableVoteHelper):
+
+    def __init__(self, ballots, tie_breaker=None, ballot_store=None, workers=None, round_log=None):
+        self.check_ballot_store(ballot_store, workers)
+        self.check_round_log(round_log)
+        super(IRV, self).__init__(ballots, tie_breaker=tie_breaker)
 
     def calculate_results(self):
-        super(IRV, self).calculate_results()
-        IRV.singularize(self.rounds)
+
+        self.ballots = [dict(ballot, count=float(ballot["count"])) for ballot in self.ballots]
+        self.candidates = set()
+        for ballot in self.ballots:
+            self.candidates.update(ballot["ballot"])
+        if not self.candidates:
+            raise Exception("Not enough candidates provided")
+
+        self.rounds = []
+        ballots = self.load_ballots()
+        remaining_candidates = set(self.candidates)
+
+        try:
+            # Loop until a single candidate remains or one holds a majority
+            while len(remaining_candidates) > 1:
+                round = {"tallies": self.count_tallies(ballots)}
+
+                # If a candidate holds a majority of the continuing votes, they win
+                largest_tally = max(round["tallies"].values())
+                if largest_tally * 2 > sum(round["tallies"].values()):
+                    round["winner"] = list(matching_keys(round["tallies"], largest_tally))[0]
+                    self.winner = round["winner"]
+                    self.record_round(round)
+                    break
+
+                # Otherwise eliminate every candidate that can no longer win
+                round.update(self.losers(round["tallies"]))
+                losers = round["losers"] if "losers" in round else [round["loser"]]
+                remaining_candidates -= set(losers)
+                ballots = self.transfer_votes(ballots, losers)
+                self.record_round(round)
+        finally:
+            self.release_ballots(ballots)
+
+        # Note the winner if only one candidate survived elimination
+        if not hasattr(self, 'winner'):
+            self.remaining_candidates = remaining_candidates
+            self.winner = list(remaining_candidates)[0]
 
     def as_dict(self):
         data = super(IRV, self).as_dict()
-        IRV.singularize(data["rounds"])
+        data["rounds"] = self.rounds
+        if self.round_log != IRV.ROUND_LOG_FULL:
+            data["round_log"] = self.round_log
+        if hasattr(self, 'remaining_candidates'):
+            data["remaining_candidates"] = self.remaining_candidates
         return data
 
-    @staticmethod
-    def singularize(rounds):
-        for r in rounds:
-            if "winners" in r:
-                r["winner"] = list(r["winners"])[0]
-                del r["winners"]
+    def losers(self, tallies):
+
+        # Find the largest group of trailing candidates whose combined tally
+        # is still below the next-lowest candidate's tally
+        ranked = sorted(tallies.items(), key=lambda item: item[1])
+        batch_size = 0
+        combined_tally = 0
+        for i in range(len(ranked) - 1):
+            combined_tally += ranked[i][1]
+            if combined_tally < ranked[i + 1][1]:
+                batch_size = i + 1
+
+        if batch_size > 1:
+            return {"losers": set([candidate for candidate, tally in ranked[:batch_size]])}
+        elif batch_size == 1:
+            return {"loser": ranked[0][0]}
+
+        # The lowest candidates are tied, so only one of them can go
+        losers = matching_keys(tallies, ranked[0][1])
+        return {
+            "tied_losers": losers,
+            "loser": self.break_ties(losers, True)
+        }
@@ -15,8 +15,9 @@
 
 from .abstract_classes import MultipleWinnerVotingSystem
 from .common_functions import matching_keys
+from .plurality_tally import PluralityTally
+import heapq
 import types
-import copy
 
 
 class PluralityAtLarge(MultipleWinnerVotingSystem):
@@ -26,14 +27,33 @@ class PluralityAtLarge(MultipleWinnerVotingSystem):
 
     def calculate_results(self):
 
+        # Use the totals of a streamed tally as they are
+        if isinstance(self.ballots, PluralityTally):
+            if self.ballots.required_winners > self.required_winners:
+                raise Exception("A ballot contained too many candidates")
+            self.candidates = set(self.ballots.tallies)
+            self.tallies = dict(self.ballots.tallies)
+        else:
+            self.standardize_ballots()
+
+            # Sum up all votes for each candidate
+            self.tallies = self.count_votes(self.candidates, self.ballots)
+
+        # Determine which candidates win
+        self.winners = self.select_winners(self.tallies)
+
+    def standardize_ballots(self):
+
+        # Convert single candidate ballots into ballot lists, on copies
+        self.ballots = [
+            ballot if isinstance(ballot["ballot"], list) else dict(ballot, ballot=[ballot["ballot"]])
+            for ballot in self.ballots
+        ]
+
         # Standardize the ballot format and extract the candidates
         self.candidates = set()
         for ballot in self.ballots:
 
-            # Convert single candidate ballots into ballot lists
-            if not isinstance(ballot["ballot"], list):
-                ballot["ballot"] = [ballot["ballot"]]
-
             # Ensure no ballot has an excess of votes
             if len(ballot["ballot"]) > self.required_winners:
                 raise Exception("A ballot contained too many candidates")
@@ -41,33 +61,35 @@ class PluralityAtLarge(MultipleWinnerVotingSystem):
             # Add all candidates on the ballot to the set
             self.candidates.update(set(ballot["ballot"]))
 
-        # Sum up all votes for each candidate
-        self.tallies = dict.fromkeys(self.candidates, 0)
-        for ballot in self.ballots:
+    # Sum the votes in a dictionary. Encoding the ballot dicts as arrays for
+    # NumPy takes a Python pass of its own and costs more than this loop saves.
+    # Integer counts stay Python ints, so tallies are exact at any size.
+    @staticmethod
+    def count_votes(candidates, ballots):
+        tallies = dict.fromkeys(candidates, 0)
+        for ballot in ballots:
+            count = ballot["count"]
             for candidate in ballot["ballot"]:
-                self.tallies[candidate] += ballot["count"]
-        tallies = copy.deepcopy(self.tallies)
-
-        # Determine which candidates win
-        winning_candidates = set()
-        while len(winning_candidates) < self.required_winners:
-
-            # Find the remaining candidates with the most votes
-            largest_tally = max(tallies.values())
-            top_candidates = matching_keys(tallies, largest_tally)
-
-            # Reduce the found candidates if there are too many
-            if len(top_candidates | winning_candidates) > self.required_winners:
-                self.tied_winners = top_candidates.copy()
-                while len(top_candidates | winning_candidates) > self.required_winners:
-                    top_candidates.remove(self.break_ties(top_candidates, True))
-
-            # Move the top candidates into the winning pile
-            winning_candidates |= top_candidates
-            for candidate in top_candidates:
-                del tallies[candidate]
-
-        self.winners = winning_candidates
+                tallies[candidate] += count
+        return tallies
+
+    # Take the required number of candidates with the largest tallies, only
+    # breaking ties among the candidates sharing the lowest winning tally
+    def select_winners(self, tallies):
+        if self.required_winners > len(tallies):
+            raise Exception("Not enough candidates provided")
+        top_candidates = heapq.nlargest(self.required_winners, tallies.items(), key=lambda item: item[1])
+        lowest_tally = top_candidates[-1][1]
+        winning_candidates = set([candidate for candidate, tally in top_candidates if tally > lowest_tally])
+        tied_candidates = matching_keys(tallies, lowest_tally)
+
+        # Reduce the found candidates if there are too many
+        if len(tied_candidates | winning_candidates) > self.required_winners:
+            self.tied_winners = tied_candidates.copy()
+            while len(tied_candidates | winning_candidates) > self.required_winners:
+                tied_candidates.remove(self.break_ties(tied_candidates, True))
+
+        return winning_candidates | tied_candidates
 
     def as_dict(self):
         data = super(PluralityAtLarge, self).as_dict()
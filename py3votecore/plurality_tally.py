@@ -0,0 +1,86 @@
+# Copyright (C) 2009, Brad Beattie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+# This class accumulates plurality (at large) votes as ballots stream in, so
+# that only the running totals are held in memory. Tallies gathered
+# separately, for instance per precinct, combine by addition and can be
+# handed to Plurality or PluralityAtLarge in place of a list of ballots.
+class PluralityTally(object):
+
+    def __init__(self, ballots=(), required_winners=1):
+        self.required_winners = required_winners
+        self.tallies = {}
+        self.add_ballots(ballots)
+
+    def add_ballot(self, ballot):
+
+        # Convert single candidate ballots into ballot lists
+        candidates = ballot["ballot"]
+        if not isinstance(candidates, list):
+            candidates = [candidates]
+
+        # Ensure no ballot has an excess of votes
+        if len(candidates) > self.required_winners:
+            raise Exception("A ballot contained too many candidates")
+
+        count = ballot.get("count", 1)
+        for candidate in candidates:
+            self.tallies[candidate] = self.tallies.get(candidate, 0) + count
+
+    def add_ballots(self, ballots):
+        for ballot in ballots:
+            self.add_ballot(ballot)
+
+    def __add__(self, other):
+        if not isinstance(other, PluralityTally):
+            return NotImplemented
+        if other.required_winners != self.required_winners:
+            raise Exception("Tallies were counted for different numbers of winners")
+        result = PluralityTally(required_winners=self.required_winners)
+        result.tallies = dict(self.tallies)
+        for candidate, tally in other.tallies.items():
+            result.tallies[candidate] = result.tallies.get(candidate, 0) + tally
+        return result
+
+    # Allows sum() over a list of tallies
+    def __radd__(self, other):
+        if other == 0:
+            return self
+        return NotImplemented
+
+    # Present the totals as one aggregated ballot per candidate
+    def __iter__(self):
+        for candidate, tally in self.tallies.items():
+            yield {"count": tally, "ballot": [candidate]}
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, PluralityTally)
+            and self.required_winners == other.required_winners
+            and self.tallies == other.tallies
+        )
+
+    def as_dict(self):
+        return {
+            "required_winners": self.required_winners,
+            "tallies": self.tallies,
+        }
+
+    @staticmethod
+    def from_dict(data):
+        tally = PluralityTally(required_winners=data["required_winners"])
+        tally.tallies = dict(data["tallies"])
+        return tally
@@ -23,8 +23,8 @@ from copy import deepcopy
 # This class implements the Schulze Method (aka the beatpath method)
 class RankedPairs(CondorcetSystem, CondorcetHelper):
 
-    def __init__(self, ballots, tie_breaker=None, ballot_notation=None):
-        super(RankedPairs, self).__init__(ballots, tie_breaker=tie_breaker, ballot_notation=ballot_notation)
+    def __init__(self, ballots, tie_breaker=None, ballot_notation=None, diagnostics=True):
+        super(RankedPairs, self).__init__(ballots, tie_breaker=tie_breaker, ballot_notation=ballot_notation, diagnostics=diagnostics)
 
     def condorcet_completion_method(self):
 
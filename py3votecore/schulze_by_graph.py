@@ -14,48 +14,105 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from .schulze_method import SchulzeMethod
-from .schulze_helper import SchulzeHelper
-from .abstract_classes import AbstractOrderingVotingSystem
+from .schulze_npr import SchulzeNPR
 from pygraph.classes.digraph import digraph
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Pairwise tallies may be given either as a dict keyed by (winner, loser)
+# tuples or as a square matrix (a NumPy array or nested lists) whose rows and
+# columns follow the given candidate labels.
+class PairwiseGraphHelper(object):
+
+    def standardize_edges(self, edges, candidates):
+        self.candidate_list = None if candidates is None else list(candidates)
+        if self.candidate_list is None:
+            self.edges = edges
+            self.candidates = set([edge[0] for edge, weight in edges.items()]) | set([edge[1] for edge, weight in edges.items()])
+        else:
+            self.edges = numpy.asarray(edges) if numpy is not None else [list(row) for row in edges]
+            if len(self.edges) != len(self.candidate_list) or any(len(row) != len(self.candidate_list) for row in self.edges):
+                raise Exception("Pairwise matrix does not match the candidates")
+            self.candidates = set(self.candidate_list)
+            self.candidate_index = dict((candidate, i) for i, candidate in enumerate(self.candidate_list))
+
+    def edge_items(self):
+        if self.candidate_list is None:
+            return list(self.edges.items())
+        return [
+            ((candidate_from, candidate_to), self.weight(i, j))
+            for i, candidate_from in enumerate(self.candidate_list)
+            for j, candidate_to in enumerate(self.candidate_list)
+            if i != j
+        ]
+
+    def preferences(self, candidate, other):
+        if self.candidate_list is None:
+            return self.edges.get((candidate, other), 0), self.edges.get((other, candidate), 0)
+        i, j = self.candidate_index[candidate], self.candidate_index[other]
+        return self.weight(i, j), self.weight(j, i)
+
+    def weight(self, i, j):
+        weight = self.edges[i][j]
+        return weight.item() if hasattr(weight, 'item') else weight
+
 
 # This class provides Schulze Method results, but bypasses ballots and uses preference tallies instead.
-class SchulzeMethodByGraph(SchulzeMethod):
+class SchulzeMethodByGraph(SchulzeMethod, PairwiseGraphHelper):
 
-    def __init__(self, edges, tie_breaker=None, ballot_notation=None):
-        self.edges = edges
-        super(SchulzeMethodByGraph, self).__init__([], tie_breaker=tie_breaker, ballot_notation=ballot_notation)
+    def __init__(self, edges, tie_breaker=None, ballot_notation=None, candidates=None, diagnostics=True):
+        self.standardize_edges(edges, candidates)
+        super(SchulzeMethodByGraph, self).__init__([], tie_breaker=tie_breaker, ballot_notation=ballot_notation, diagnostics=diagnostics)
 
     def standardize_ballots(self, ballots, ballot_notation):
         self.ballots = []
-        self.candidates = set([edge[0] for edge, weight in self.edges.items()]) | set([edge[1] for edge, weight in self.edges.items()])
+
+    def preferences(self, candidate, other):
+        return PairwiseGraphHelper.preferences(self, candidate, other)
 
     def ballots_into_graph(self, candidates, ballots):
         graph = digraph()
         graph.add_nodes(candidates)
-        for edge in self.edges.items():
+        for edge in self.edge_items():
             graph.add_edge(edge[0], edge[1])
         return graph
 
 # This class provides Schulze NPR results, but bypasses ballots and uses preference tallies instead.
 
 
-class SchulzeNPRByGraph(AbstractOrderingVotingSystem, SchulzeHelper):
+class SchulzeNPRByGraph(SchulzeNPR, PairwiseGraphHelper):
 
-    def __init__(self, edges, winner_threshold=None, tie_breaker=None, ballot_notation=None):
-        self.edges = edges
-        self.candidates = set([edge[0] for edge, weight in edges.items()]) | set([edge[1] for edge, weight in edges.items()])
-        super(SchulzeNPRByGraph, self).__init__(
+    def __init__(self, edges, winner_threshold=None, tie_breaker=None, ballot_notation=None, candidates=None):
+        self.standardize_edges(edges, candidates)
+        super(SchulzeNPR, self).__init__(
             [],
             single_winner_class=SchulzeMethodByGraph,
             winner_threshold=winner_threshold,
             tie_breaker=tie_breaker,
         )
 
-    def ballots_without_candidate(self, ballots, candidate):
-        self.edges = dict([(edge, weight) for edge, weight in self.edges.items() if edge[0] != candidate and edge[1] != candidate])
+    def pairwise_preferences(self):
         return self.edges
 
-    def calculate_results(self):
-        self.ballots = self.edges
-        super(SchulzeNPRByGraph, self).calculate_results()
+    # Matrix tallies are never rebuilt; eliminated candidates are masked out
+    # of the rows and columns instead
+    def strong_pairs_among(self, candidates):
+        if self.candidate_list is None:
+            return super(SchulzeNPRByGraph, self).strong_pairs_among(candidates)
+        indexes = [i for i, candidate in enumerate(self.candidate_list) if candidate in candidates]
+        if numpy is not None:
+            matrix = self.edges[numpy.ix_(indexes, indexes)]
+            return [
+                ((self.candidate_list[indexes[i]], self.candidate_list[indexes[j]]), matrix[i, j].item())
+                for i, j in zip(*numpy.nonzero(matrix > matrix.T))
+            ]
+        return [
+            ((self.candidate_list[i], self.candidate_list[j]), self.edges[i][j])
+            for i in indexes
+            for j in indexes
+            if self.edges[i][j] > self.edges[j][i]
+        ]
@@ -13,7 +13,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from pygraph.algorithms.accessibility import accessibility, mutual_accessibility
 from pygraph.classes.digraph import digraph
 from pygraph.algorithms.minmax import maximum_flow
 from .condorcet import CondorcetHelper
@@ -37,30 +36,114 @@ class SchulzeHelper(CondorcetHelper):
 
     def schwartz_set_heuristic(self):
 
-        # Iterate through using the Schwartz set heuristic
+        # Index the graph with a bitset of successors per node
         self.actions = []
-        while len(self.graph.edges()) > 0:
-            access = accessibility(self.graph)
-            mutual_access = mutual_accessibility(self.graph)
-            candidates_to_remove = set()
-            for candidate in self.graph.nodes():
-                candidates_to_remove |= (set(access[candidate]) - set(mutual_access[candidate]))
+        nodes = self.graph.nodes()
+        index = dict((node, i) for i, node in enumerate(nodes))
+        successors = [0] * len(nodes)
+        edge_weights = self.edge_weights(self.graph)
+        for edge in edge_weights:
+            successors[index[edge[0]]] |= 1 << index[edge[1]]
+        remaining = (1 << len(nodes)) - 1
+
+        # Iterate through using the Schwartz set heuristic
+        while len(edge_weights) > 0:
+
+            # Nodes reachable from outside their strongly connected component
+            # are at the end of non-cycle paths
+            components = self.strongly_connected_components(successors, remaining)
+            dominated = 0
+            for component in components:
+                reached = 0
+                members = component
+                while members:
+                    member = members & -members
+                    reached |= successors[member.bit_length() - 1]
+                    members ^= member
+                dominated |= reached & remaining & ~component
+            for component in components:
+                if component & dominated:
+                    dominated |= component
 
             # Remove nodes at the end of non-cycle paths
-            if len(candidates_to_remove) > 0:
+            if dominated:
+                candidates_to_remove = set(nodes[i] for i in range(len(nodes)) if dominated >> i & 1)
                 self.actions.append({'nodes': candidates_to_remove})
                 for candidate in candidates_to_remove:
                     self.graph.del_node(candidate)
+                remaining &= ~dominated
+                edge_weights = dict(
+                    (edge, weight) for edge, weight in edge_weights.items()
+                    if remaining >> index[edge[0]] & 1 and remaining >> index[edge[1]] & 1
+                )
 
             # If none exist, remove the weakest edges
             else:
-                edge_weights = self.edge_weights(self.graph)
                 self.actions.append({'edges': matching_keys(edge_weights, min(edge_weights.values()))})
                 for edge in self.actions[-1]["edges"]:
                     self.graph.del_edge(edge)
+                    successors[index[edge[0]]] &= ~(1 << index[edge[1]])
+                    del edge_weights[edge]
 
         self.graph_winner()
 
+    # Tarjan's algorithm over the remaining nodes, without recursion. Nodes,
+    # successors and the returned components are all bitsets.
+    @staticmethod
+    def strongly_connected_components(successors, remaining):
+        components = []
+        order = [-1] * len(successors)
+        lowest = [-1] * len(successors)
+        stack = []
+        on_stack = 0
+        counter = 0
+        unvisited = remaining
+        while unvisited:
+            root = unvisited & -unvisited
+            work = []
+            target = root
+            while True:
+
+                # Visit a new node
+                if target is not None:
+                    node = target.bit_length() - 1
+                    order[node] = lowest[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack |= target
+                    unvisited ^= target
+                    work.append([node, successors[node] & remaining])
+                    target = None
+
+                node, targets = work[-1]
+                if targets:
+                    bit = targets & -targets
+                    work[-1][1] ^= bit
+                    successor = bit.bit_length() - 1
+                    if unvisited & bit:
+                        target = bit
+                    elif on_stack & bit:
+                        lowest[node] = min(lowest[node], order[successor])
+                    continue
+
+                # All successors seen, so close the node off
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowest[parent] = min(lowest[parent], lowest[node])
+                if lowest[node] == order[node]:
+                    component = 0
+                    while True:
+                        member = stack.pop()
+                        component |= 1 << member
+                        if member == node:
+                            break
+                    on_stack &= ~component
+                    components.append(component)
+                if not work:
+                    break
+        return components
+
     def generate_vote_management_graph(self):
         self.vote_management_graph = digraph()
         self.vote_management_graph.add_nodes(self.completed_patterns)
@@ -20,11 +20,12 @@ from .condorcet import CondorcetSystem
 # This class implements the Schulze Method (aka the beatpath method)
 class SchulzeMethod(CondorcetSystem, SchulzeHelper):
 
-    def __init__(self, ballots, tie_breaker=None, ballot_notation=None):
+    def __init__(self, ballots, tie_breaker=None, ballot_notation=None, diagnostics=True):
         super(SchulzeMethod, self).__init__(
             ballots,
             tie_breaker=tie_breaker,
             ballot_notation=ballot_notation,
+            diagnostics=diagnostics,
         )
 
     def as_dict(self):
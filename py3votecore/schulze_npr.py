@@ -16,9 +16,14 @@
 from .abstract_classes import AbstractOrderingVotingSystem
 from .schulze_helper import SchulzeHelper
 from .schulze_method import SchulzeMethod
+from pygraph.classes.digraph import digraph
+from copy import copy
 
 
-#
+# This class orders the candidates by repeatedly electing the Schulze winner
+# and removing them. Removing a candidate leaves the pairwise preferences
+# between the others untouched, so the ballots are tallied once and each
+# position is decided from the remaining rows and columns of that tally.
 class SchulzeNPR(AbstractOrderingVotingSystem, SchulzeHelper):
 
     def __init__(self, ballots, winner_threshold=None, tie_breaker=None, ballot_notation=None):
@@ -30,9 +35,64 @@ class SchulzeNPR(AbstractOrderingVotingSystem, SchulzeHelper):
             tie_breaker=tie_breaker,
         )
 
+    def calculate_results(self):
+        self.order = []
+        self.rounds = []
+        self.pairs = self.pairwise_preferences()
+        remaining_candidates = set(self.candidates)
+        while (
+            len(remaining_candidates) > 1
+            and (self.winner_threshold is None or len(self.order) < self.winner_threshold)
+        ):
+
+            # Given the remaining candidates, who should win?
+            self.graph = digraph()
+            self.graph.add_nodes(remaining_candidates)
+            for pair, weight in self.strong_pairs_among(remaining_candidates):
+                self.graph.add_edge(pair, weight)
+            self.graph_winner()
+
+            # Mark the candidate that won, and any ties that might have occurred
+            r = {'winner': self.winner}
+            self.order.append(self.winner)
+            if hasattr(self, 'tied_winners'):
+                r['tied_winners'] = self.tied_winners
+            self.rounds.append(r)
+
+            # Remove the candidate from the remaining candidates
+            remaining_candidates.remove(self.winner)
+            for attribute in ('winner', 'tied_winners', 'actions', 'graph'):
+                if hasattr(self, attribute):
+                    delattr(self, attribute)
+
+        # Note the last remaining candidate
+        if remaining_candidates and (self.winner_threshold is None or len(self.order) < self.winner_threshold):
+            r = {'winner': list(remaining_candidates)[0]}
+            self.order.append(r['winner'])
+            self.rounds.append(r)
+
+    def pairwise_preferences(self):
+        if self.profile is not None:
+            return self.profile.pairs()
+        return self.edge_weights(self.ballots_into_graph(self.candidates, self.ballots))
+
+    # Only the stronger direction of each pair survives remove_weak_edges, so
+    # the graph is built from those edges directly
+    def strong_pairs_among(self, candidates):
+        return [
+            (pair, weight)
+            for pair, weight in self.pairs.items()
+            if pair[0] in candidates and pair[1] in candidates and weight > self.pairs.get((pair[1], pair[0]), 0)
+        ]
+
+    # Return the ballots without the given candidate, leaving the given ones
+    # untouched. Each ballot keeps its type, so sparse ballots still rate the
+    # candidates they leave out.
     @staticmethod
     def ballots_without_candidate(ballots, candidate):
+        remaining_ballots = []
         for ballot in ballots:
-            if candidate in ballot['ballot']:
-                del ballot['ballot'][candidate]
-        return ballots
+            ratings = copy(ballot['ballot'])
+            ratings.pop(candidate, None)
+            remaining_ballots.append(dict(ballot, ballot=ratings))
+        return remaining_ballots
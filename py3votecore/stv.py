@@ -14,26 +14,212 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from .abstract_classes import MultipleWinnerVotingSystem
+from .ballot_array import BallotArray
+from .ballot_tree import BallotTree
 from collections import defaultdict
 from .common_functions import matching_keys
-import copy
 import math
 
 
+# This class provides the ballot bookkeeping shared by the transferable vote
+# systems. Ballots are either kept as a list of ballot dicts, aggregated into a
+# BallotTree (eliminations and surplus transfers then move whole groups of
+# ballots sharing a prefix at once), or copied into a BallotArray in shared
+# memory and counted in parallel by a pool of worker processes.
+class TransferableVoteHelper(object):
+
+    BALLOT_STORE_LIST = "list"
+    BALLOT_STORE_TREE = "tree"
+    BALLOT_STORE_PARALLEL = "parallel"
+    ROUND_LOG_FULL = "full"
+    ROUND_LOG_DELTA = "delta"
+    ROUND_LOG_NONE = "none"
+
+    def check_ballot_store(self, ballot_store, workers=None):
+        if ballot_store is None:
+            ballot_store = TransferableVoteHelper.BALLOT_STORE_LIST
+        if ballot_store not in (
+            TransferableVoteHelper.BALLOT_STORE_LIST,
+            TransferableVoteHelper.BALLOT_STORE_TREE,
+            TransferableVoteHelper.BALLOT_STORE_PARALLEL,
+        ):
+            raise Exception("Unknown ballot store specified", ballot_store)
+        self.ballot_store = ballot_store
+        self.workers = workers
+
+    def check_round_log(self, round_log):
+        if round_log is None:
+            round_log = TransferableVoteHelper.ROUND_LOG_FULL
+        if round_log not in (
+            TransferableVoteHelper.ROUND_LOG_FULL,
+            TransferableVoteHelper.ROUND_LOG_DELTA,
+            TransferableVoteHelper.ROUND_LOG_NONE,
+        ):
+            raise Exception("Unknown round log specified", round_log)
+        self.round_log = round_log
+        self.last_tallies = {}
+
+    def load_ballots(self, candidates=None):
+        if self.ballot_store == TransferableVoteHelper.BALLOT_STORE_TREE:
+            return BallotTree(self.ballots, candidates)
+        elif self.ballot_store == TransferableVoteHelper.BALLOT_STORE_PARALLEL:
+            return BallotArray(self.ballots, candidates, workers=self.workers)
+        if candidates is None:
+            return [dict(ballot, ballot=list(ballot["ballot"])) for ballot in self.ballots]
+        return [dict(ballot, ballot=[x for x in ballot["ballot"] if x in candidates]) for ballot in self.ballots]
+
+    # Load the ballots again for the given candidates. The parallel store
+    # reuses its worker pool rather than starting a new one.
+    def reload_ballots(self, ballots, candidates=None):
+        if self.ballot_store == TransferableVoteHelper.BALLOT_STORE_PARALLEL:
+            return ballots.load(self.ballots, candidates)
+        return self.load_ballots(candidates)
+
+    def release_ballots(self, ballots):
+        if self.ballot_store == TransferableVoteHelper.BALLOT_STORE_PARALLEL:
+            ballots.close()
+
+    def count_tallies(self, ballots):
+        if self.ballot_store != TransferableVoteHelper.BALLOT_STORE_LIST:
+            return ballots.tallies()
+        return self.tallies(ballots)
+
+    def has_active_ballots(self, ballots):
+        if self.ballot_store != TransferableVoteHelper.BALLOT_STORE_LIST:
+            return ballots.has_active_ballots()
+        return len([ballot for ballot in ballots if ballot["count"] > 0 and ballot["ballot"]]) > 0
+
+    def count_quota(self, ballots, seats=1):
+        if self.ballot_store != TransferableVoteHelper.BALLOT_STORE_LIST:
+            return int(math.floor(ballots.voters() / (seats + 1)) + 1)
+        return self.droop_quota(ballots, seats)
+
+    # Remove candidates from the ballots, first reweighting the ballots whose
+    # top preference is a key of factors
+    def transfer_votes(self, ballots, candidates, factors=None):
+        if self.ballot_store != TransferableVoteHelper.BALLOT_STORE_LIST:
+            return ballots.remove_candidates(candidates, factors)
+        if factors:
+            for ballot in ballots:
+                if ballot["ballot"] and ballot["ballot"][0] in factors:
+                    ballot["count"] *= factors[ballot["ballot"][0]]
+        return self.remove_candidates_from_ballots(candidates, ballots)
+
+    def surplus_factors(self, tallies, winners):
+        return dict([
+            (candidate, (tallies[candidate] - self.quota) / tallies[candidate])
+            for candidate in winners
+        ])
+
+    # Append a round to the log. A "delta" log only keeps the tallies that
+    # differ from the previous round's (less the candidates it removed, or
+    # nothing after a reset), while a "none" log drops the tallies entirely.
+    def record_round(self, round):
+        tallies = round["tallies"]
+        if self.round_log == TransferableVoteHelper.ROUND_LOG_DELTA:
+            carried = self.carried_tallies(self.rounds[-1] if self.rounds else None, round, self.last_tallies)
+            round["tallies"] = dict([
+                (candidate, tally)
+                for candidate, tally in tallies.items()
+                if candidate not in carried or carried[candidate] != tally
+            ])
+        elif self.round_log == TransferableVoteHelper.ROUND_LOG_NONE:
+            del round["tallies"]
+        self.last_tallies = tallies
+        self.rounds.append(round)
+
+    @staticmethod
+    def carried_tallies(previous_round, round, previous_tallies):
+        if previous_round is None or round.get("note") == "reset":
+            return {}
+        removed = TransferableVoteHelper.removed_candidates(previous_round)
+        return dict([
+            (candidate, tally)
+            for candidate, tally in previous_tallies.items()
+            if candidate not in removed
+        ])
+
+    @staticmethod
+    def removed_candidates(round):
+        removed = set(round.get("winners", set())) | set(round.get("losers", set()))
+        for key in ("winner", "loser"):
+            if key in round:
+                removed.add(round[key])
+        return removed
+
+    # Rebuild the full tallies of a round, whatever the round log mode
+    def round_tallies(self, index):
+        index = range(len(self.rounds))[index]
+        if self.round_log == TransferableVoteHelper.ROUND_LOG_FULL:
+            return self.rounds[index]["tallies"]
+        elif self.round_log == TransferableVoteHelper.ROUND_LOG_DELTA:
+            tallies = None
+            for i in range(index + 1):
+                tallies = self.carried_tallies(self.rounds[i - 1] if i else None, self.rounds[i], tallies)
+                tallies.update(self.rounds[i]["tallies"])
+            return tallies
+
+        # Without a log, replay the recorded actions against the ballots
+        winners = set()
+        ballots = self.load_ballots()
+        try:
+            for i in range(index + 1):
+                if self.rounds[i].get("note") == "reset":
+                    ballots = self.reload_ballots(ballots, self.candidates - winners)
+                tallies = self.count_tallies(ballots)
+                if i < index:
+                    removed = self.removed_candidates(self.rounds[i])
+                    round_winners = self.rounds[i].get("winners", set())
+                    winners |= round_winners
+                    ballots = self.transfer_votes(ballots, removed, self.surplus_factors(tallies, round_winners))
+        finally:
+            self.release_ballots(ballots)
+        return tallies
+
+    @staticmethod
+    def remove_candidates_from_ballots(candidates, ballots):
+        for ballot in ballots:
+            for candidate in candidates:
+                if candidate in ballot["ballot"]:
+                    ballot["ballot"].remove(candidate)
+        return ballots
+
+    @staticmethod
+    def tallies(ballots):
+        tallies = dict()
+        for ballot in ballots:
+            for candidate in ballot["ballot"]:
+                tallies[candidate] = 0
+        for ballot in ballots:
+            if ballot["ballot"]:
+                tallies[ballot["ballot"][0]] += ballot["count"]
+        return dict((candidate, votes) for (candidate, votes) in tallies.items())
+
+    @staticmethod
+    def droop_quota(ballots, seats=1):
+        voters = 0
+        for ballot in ballots:
+            if ballot["ballot"]:
+                voters += ballot["count"]
+        return int(math.floor(voters / (seats + 1)) + 1)
+
+
 # This class implements the Single Transferable vote (aka STV) in its most
 # classic form (see http://en.wikipedia.org/wiki/Single_transferable_vote).
 # Alternate counting methods such as Meek's and Warren's would be nice, but
 # would need to be covered in a separate class.
-class STV(MultipleWinnerVotingSystem):
+class STV(MultipleWinnerVotingSystem, TransferableVoteHelper):
 
-    def __init__(self, ballots, tie_breaker=None, required_winners=1):
+    def __init__(self, ballots, tie_breaker=None, required_winners=1, ballot_store=None, workers=None, round_log=None):
+        self.check_ballot_store(ballot_store, workers)
+        self.check_round_log(round_log)
         super(STV, self).__init__(ballots, tie_breaker=tie_breaker, required_winners=required_winners)
 
     def calculate_results(self):
 
+        self.ballots = [dict(ballot, count=float(ballot["count"])) for ballot in self.ballots]
         self.candidates = set()
         for ballot in self.ballots:
-            ballot["count"] = float(ballot["count"])
             self.candidates.update(ballot["ballot"])
         if len(self.candidates) < self.required_winners:
             raise Exception("Not enough candidates provided")
@@ -42,57 +228,54 @@ class STV(MultipleWinnerVotingSystem):
         self.rounds = []
         self.winners = set()
         quota = self.quota
-        ballots = copy.deepcopy(self.ballots)
+        ballots = self.load_ballots()
         remaining_candidates = self.candidates - self.winners
 
-        # Loop until we have enough candidates
-        while len(self.winners) < self.required_winners and len(remaining_candidates) + len(self.winners) != self.required_winners:
-
-            # Repopulate the remaining candidates if necessary
-            if not remaining_candidates:
-                remaining_candidates = self.candidates - self.winners
-
-            # If all the votes have been used up, start from scratch for the remaining candidates
-            round = {}
-            if len([ballot for ballot in ballots if ballot["count"] > 0 and ballot["ballot"]]) == 0:
-                remaining_candidates = self.candidates - self.winners
-                round["note"] = "reset"
-                ballots = copy.deepcopy(self.ballots)
-                for ballot in ballots:
-                    ballot["ballot"] = [x for x in ballot["ballot"] if x in remaining_candidates]
-                quota = STV.droop_quota(ballots, self.required_winners - len(self.winners))
-
-            round["tallies"] = self.tallies(ballots)
-            if round["tallies"]:
-
-                # If any candidates meet or exceeds the quota, they're a winner
-                if max(round["tallies"].values()) >= quota:
-
-                    # Collect candidates as winners
-                    round["winners"] = set([
-                        candidate
-                        for candidate, tally in list(round["tallies"].items())
-                        if tally >= self.quota
-                    ])
-                    self.winners |= round["winners"]
-                    remaining_candidates -= round["winners"]
-
-                    # Redistribute excess votes
-                    for ballot in ballots:
-                        if ballot["ballot"] and ballot["ballot"][0] in round["winners"]:
-                            ballot["count"] *= (round["tallies"][ballot["ballot"][0]] - self.quota) / round["tallies"][ballot["ballot"][0]]
-
-                    # Remove candidates from remaining ballots
-                    ballots = self.remove_candidates_from_ballots(round["winners"], ballots)
-
-                # If no candidate exceeds the quota, elimiate the least preferred
-                else:
-                    round.update(self.loser(round["tallies"]))
-                    remaining_candidates.remove(round["loser"])
-                    ballots = self.remove_candidates_from_ballots([round["loser"]], ballots)
-
-            # Record this round's actions
-            self.rounds.append(round)
+        try:
+            # Loop until we have enough candidates
+            while len(self.winners) < self.required_winners and len(remaining_candidates) + len(self.winners) != self.required_winners:
+
+                # Repopulate the remaining candidates if necessary
+                if not remaining_candidates:
+                    remaining_candidates = self.candidates - self.winners
+
+                # If all the votes have been used up, start from scratch for the remaining candidates
+                round = {}
+                if not self.has_active_ballots(ballots):
+                    remaining_candidates = self.candidates - self.winners
+                    round["note"] = "reset"
+                    ballots = self.reload_ballots(ballots, remaining_candidates)
+                    quota = self.count_quota(ballots, self.required_winners - len(self.winners))
+
+                round["tallies"] = self.count_tallies(ballots)
+                if round["tallies"]:
+
+                    # If any candidates meet or exceeds the quota, they're a winner
+                    if max(round["tallies"].values()) >= quota:
+
+                        # Collect candidates as winners
+                        round["winners"] = set([
+                            candidate
+                            for candidate, tally in list(round["tallies"].items())
+                            if tally >= self.quota
+                        ])
+                        self.winners |= round["winners"]
+                        remaining_candidates -= round["winners"]
+
+                        # Redistribute excess votes and remove candidates from remaining ballots
+                        factors = self.surplus_factors(round["tallies"], round["winners"])
+                        ballots = self.transfer_votes(ballots, round["winners"], factors)
+
+                    # If no candidate exceeds the quota, elimiate the least preferred
+                    else:
+                        round.update(self.loser(round["tallies"]))
+                        remaining_candidates.remove(round["loser"])
+                        ballots = self.transfer_votes(ballots, [round["loser"]])
+
+                # Record this round's actions
+                self.record_round(round)
+        finally:
+            self.release_ballots(ballots)
 
         # Append the final winner and return
         if len(self.winners) < self.required_winners:
@@ -103,6 +286,8 @@ class STV(MultipleWinnerVotingSystem):
         data = super(STV, self).as_dict()
         data["quota"] = self.quota
         data["rounds"] = self.rounds
+        if self.round_log != STV.ROUND_LOG_FULL:
+            data["round_log"] = self.round_log
         if hasattr(self, 'remaining_candidates'):
             data["remaining_candidates"] = self.remaining_candidates
         return data
@@ -116,29 +301,3 @@ class STV(MultipleWinnerVotingSystem):
                 "tied_losers": losers,
                 "loser": self.break_ties(losers, True)
             }
-
-    @staticmethod
-    def remove_candidates_from_ballots(candidates, ballots):
-        for ballot in ballots:
-            for candidate in candidates:
-                if candidate in ballot["ballot"]:
-                    ballot["ballot"].remove(candidate)
-        return ballots
-
-    def tallies(self, ballots):
-        tallies = dict()
-        for ballot in ballots:
-            for candidate in ballot["ballot"]:
-                tallies[candidate] = 0
-        for ballot in ballots:
-            if ballot["ballot"]:
-                tallies[ballot["ballot"][0]] += ballot["count"]
-        return dict((candidate, votes) for (candidate, votes) in tallies.items())
-
-    @staticmethod
-    def droop_quota(ballots, seats=1):
-        voters = 0
-        for ballot in ballots:
-            if ballot["ballot"]:
-                voters += ballot["count"]
-        return int(math.floor(voters / (seats + 1)) + 1)
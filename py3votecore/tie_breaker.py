@@ -13,51 +13,75 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from copy import copy
 import random
 import types
 
 
-# This class provides tie breaking methods
+# This class provides tie breaking methods. The position of every candidate in
+# the random ordering is indexed once, so each tie is broken in time
+# proportional to the number (and width) of the tied candidates.
+#
+# Given a seed, the ordering is drawn from a private random generator over the
+# sorted candidates, so reruns of a count produce the same ordering. A tie
+# breaker created without candidates draws its ordering the first time an
+# election prepares it, and is then shared by every round and sub-election
+# it is handed to.
 class TieBreaker(object):
 
     #
-    def __init__(self, candidate_range):
+    def __init__(self, candidate_range=None, seed=None):
         self.ties_broken = False
-        self.random_ordering = list(candidate_range)
+        self.seed = seed
+        self.random_ordering = None
+        if candidate_range is not None:
+            self.prepare(candidate_range)
+
+    #
+    def prepare(self, candidate_range):
+        if self.random_ordering is not None:
+            return self
+        random_ordering = list(candidate_range)
         if not isinstance(candidate_range, list):
-            random.shuffle(self.random_ordering)
+            if self.seed is None:
+                random.shuffle(random_ordering)
+            else:
+                random_ordering.sort(key=repr)
+                random.Random(self.seed).shuffle(random_ordering)
+        self.random_ordering = random_ordering
+        return self
+
+    #
+    @property
+    def random_ordering(self):
+        return self._random_ordering
+
+    #
+    @random_ordering.setter
+    def random_ordering(self, random_ordering):
+        self._random_ordering = random_ordering
+        self.ranks = dict((candidate, rank) for rank, candidate in enumerate(random_ordering or []))
 
     #
     def break_ties(self, tied_candidates, reverse=False):
         self.ties_broken = True
-        random_ordering = copy(self.random_ordering)
-        if reverse:
-            random_ordering.reverse()
         # The following line is from @gleb-chipiga
-        if isinstance(list(tied_candidates)[0], tuple):
-            result = self.break_complex_ties(tied_candidates, random_ordering)
+        if isinstance(next(iter(tied_candidates)), tuple):
+            result = self.break_complex_ties(tied_candidates, self.ranks, reverse)
         else:
-            result = self.break_simple_ties(tied_candidates, random_ordering)
+            result = self.break_simple_ties(tied_candidates, self.ranks, reverse)
         return result
 
     #
     @staticmethod
-    def break_simple_ties(tied_candidates, random_ordering):
-        for candidate in random_ordering:
-            if candidate in tied_candidates:
-                return candidate
+    def break_simple_ties(tied_candidates, ranks, reverse=False):
+        choose = max if reverse else min
+        return choose((candidate for candidate in tied_candidates if candidate in ranks), key=ranks.get, default=None)
 
     #
     @staticmethod
-    def break_complex_ties(tied_candidates, random_ordering):
-        max_columns = len(list(tied_candidates)[0])
-        column = 0
-        while len(tied_candidates) > 1 and column < max_columns:
-            min_index = min(random_ordering.index(list(candidate)[column]) for candidate in tied_candidates)
-            tied_candidates = set([candidate for candidate in tied_candidates if candidate[column] == random_ordering[min_index]])
-            column += 1
-        return list(tied_candidates)[0]
+    def break_complex_ties(tied_candidates, ranks, reverse=False):
+        choose = max if reverse else min
+        return choose(tied_candidates, key=lambda candidate: tuple(ranks[member] for member in candidate))
 
     #
     def as_list(self):
@@ -0,0 +1,109 @@
+# Copyright (C) 2009, Brad Beattie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from py3votecore import ballot_array
+from py3votecore.ballot_array import BallotArray
+from py3votecore.stv import STV
+import unittest
+import copy
+
+
+class TestBallotArray(unittest.TestCase):
+
+    def setUp(self):
+        self.ballots = [
+            {"count": 3, "ballot": ["a", "b", "c"]},
+            {"count": 2, "ballot": ["a", "b"]},
+            {"count": 4, "ballot": ["b", "c", "a"]},
+            {"count": 1, "ballot": ["c"]},
+        ]
+
+    def test_remove_candidates(self):
+        ballots = BallotArray(self.ballots, workers=1)
+        self.assertEqual(ballots.tallies(), {"a": 5, "b": 4, "c": 1})
+        ballots.remove_candidates(set(["a"]), {"a": 0.5})
+        self.assertEqual(ballots.tallies(), {"b": 6.5, "c": 1})
+        self.assertEqual(ballots.voters(), 7.5)
+        ballots.remove_candidates(set(["b", "c"]))
+        self.assertEqual(ballots.tallies(), {})
+        self.assertFalse(ballots.has_active_ballots())
+        ballots.close()
+
+    # Shards are combined in a fixed order, whatever the number of workers
+    def test_workers(self):
+        shard_size = ballot_array.SHARD_SIZE
+        ballot_array.SHARD_SIZE = 2
+        try:
+            input = [
+                {"count": 4, "ballot": ["orange"]},
+                {"count": 2, "ballot": ["pear", "orange"]},
+                {"count": 8, "ballot": ["chocolate", "strawberry"]},
+                {"count": 4, "ballot": ["chocolate", "sweets"]},
+                {"count": 1, "ballot": ["strawberry"]},
+                {"count": 1, "ballot": ["sweets"]}
+            ]
+            output_serial = STV(copy.deepcopy(input), required_winners=3, ballot_store=STV.BALLOT_STORE_PARALLEL, workers=1).as_dict()
+            output_parallel = STV(copy.deepcopy(input), required_winners=3, ballot_store=STV.BALLOT_STORE_PARALLEL, workers=2).as_dict()
+        finally:
+            ballot_array.SHARD_SIZE = shard_size
+
+        # Run tests
+        self.assertEqual(output_parallel, output_serial)
+        self.assertEqual(output_parallel, STV(copy.deepcopy(input), required_winners=3).as_dict())
+
+    # Loading the ballots again keeps the worker pool
+    def test_load(self):
+        shard_size = ballot_array.SHARD_SIZE
+        ballot_array.SHARD_SIZE = 2
+        try:
+            ballots = BallotArray(self.ballots, workers=2)
+            pool = ballots.pool
+            ballots.remove_candidates(set(["a"]))
+            self.assertEqual(ballots.tallies(), {"b": 9, "c": 1})
+            ballots.load(self.ballots, set(["a", "c"]))
+            self.assertIs(ballots.pool, pool)
+            self.assertEqual(ballots.tallies(), {"a": 5, "c": 5})
+            ballots.close()
+            ballots.close()
+        finally:
+            ballot_array.SHARD_SIZE = shard_size
+        self.assertIsNone(ballots.pool)
+        self.assertIsNone(ballots.memory)
+
+    # The shared buffer and the workers are released when the count fails
+    def test_release_on_error(self):
+        loaded = []
+
+        class FailingSTV(STV):
+            def load_ballots(self, candidates=None):
+                loaded.append(super(FailingSTV, self).load_ballots(candidates))
+                return loaded[-1]
+
+            def record_round(self, round):
+                raise RuntimeError("count failed")
+
+        shard_size = ballot_array.SHARD_SIZE
+        ballot_array.SHARD_SIZE = 2
+        try:
+            with self.assertRaises(RuntimeError):
+                FailingSTV(copy.deepcopy(self.ballots), ballot_store=STV.BALLOT_STORE_PARALLEL, workers=2)
+        finally:
+            ballot_array.SHARD_SIZE = shard_size
+        self.assertEqual(len(loaded), 1)
+        self.assertIsNone(loaded[0].pool)
+        self.assertIsNone(loaded[0].memory)
+
+if __name__ == "__main__":
+    unittest.main()
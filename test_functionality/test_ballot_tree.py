@@ -0,0 +1,49 @@
+# Copyright (C) 2009, Brad Beattie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from py3votecore.ballot_tree import BallotTree
+import unittest
+
+
+class TestBallotTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = BallotTree([
+            {"count": 3, "ballot": ["a", "b", "c"]},
+            {"count": 2, "ballot": ["a", "b"]},
+            {"count": 4, "ballot": ["b", "c", "a"]},
+            {"count": 1, "ballot": ["c"]},
+        ])
+
+    def test_shared_prefixes(self):
+        self.assertEqual(len(self.tree), 7)
+        self.assertEqual(self.tree.tallies(), {"a": 5, "b": 4, "c": 1})
+        self.assertEqual(self.tree.voters(), 10)
+
+    def test_remove_candidates(self):
+        self.tree.remove_candidates(set(["b"]))
+        self.assertEqual(self.tree.tallies(), {"a": 5, "c": 5})
+        self.assertEqual(len(self.tree), 4)
+
+    def test_remove_candidates_with_factors(self):
+        self.tree.remove_candidates(set(["a"]), {"a": 0.5})
+        self.assertEqual(self.tree.tallies(), {"b": 6.5, "c": 1})
+        self.assertEqual(self.tree.voters(), 7.5)
+        self.tree.remove_candidates(set(["b", "c"]))
+        self.assertEqual(self.tree.tallies(), {})
+        self.assertFalse(self.tree.has_active_ballots())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,6 +15,7 @@
 
 from py3votecore.schulze_method import SchulzeMethod
 import unittest
+import copy
 
 
 class TestCondorcet(unittest.TestCase):
@@ -112,5 +113,73 @@ class TestCondorcet(unittest.TestCase):
             "winner": 'Andrea'
         })
 
+    def test_short_rankings(self):
+
+        # Generate data
+        candidates = ["Candidate %d" % i for i in range(200)]
+        input = [
+            {"count": 3, "ballot": [["Candidate 1"], ["Candidate 0"]]},
+            {"count": 2, "ballot": [["Candidate 0", "Candidate 2"]]},
+            {"count": 1, "ballot": [[candidate] for candidate in reversed(candidates)]},
+        ]
+        system = SchulzeMethod(input, ballot_notation=SchulzeMethod.BALLOT_NOTATION_GROUPING)
+        output = system.as_dict()
+
+        # Run tests
+        self.assertEqual(sorted(system.ballots[0]["ballot"].keys()), ["Candidate 0", "Candidate 1"])
+        self.assertEqual(system.ballots[0]["ballot"]["Candidate 7"], 0)
+        self.assertEqual(output["pairs"][("Candidate 0", "Candidate 1")], 2)
+        self.assertEqual(output["pairs"][("Candidate 1", "Candidate 0")], 4)
+        self.assertEqual(output["pairs"][("Candidate 0", "Candidate 2")], 3)
+        self.assertEqual(output["pairs"][("Candidate 0", "Candidate 7")], 5)
+        self.assertEqual(output["pairs"][("Candidate 7", "Candidate 0")], 1)
+        self.assertEqual(output["pairs"][("Candidate 5", "Candidate 7")], 0)
+        self.assertEqual(output["winner"], "Candidate 1")
+
+    def test_early_condorcet_winner(self):
+
+        # Generate data
+        input = [
+            {"count": 12, "ballot": [["Andrea"], ["Brad"], ["Carter"]]},
+            {"count": 26, "ballot": [["Andrea"], ["Carter"], ["Brad"]]},
+            {"count": 13, "ballot": [["Carter"], ["Andrea"], ["Brad"]]},
+            {"count": 27, "ballot": [["Brad"]]},
+        ]
+        output = SchulzeMethod(input, ballot_notation=SchulzeMethod.BALLOT_NOTATION_GROUPING, diagnostics=False).as_dict()
+
+        # Run tests
+        self.assertEqual(output, {
+            "candidates": set(['Carter', 'Brad', 'Andrea']),
+            "winner": 'Andrea',
+        })
+
+    def test_early_condorcet_winner_fallback(self):
+
+        # Generate data
+        input = [
+            {"count": 4, "ballot": [["Andrea"], ["Brad"], ["Carter"]]},
+            {"count": 3, "ballot": [["Brad"], ["Carter"], ["Andrea"]]},
+            {"count": 2, "ballot": [["Carter"], ["Andrea"], ["Brad"]]},
+        ]
+        output = SchulzeMethod(input, ballot_notation=SchulzeMethod.BALLOT_NOTATION_GROUPING, diagnostics=False).as_dict()
+
+        # Run tests
+        self.assertEqual(output["winner"], 'Andrea')
+        self.assertEqual(output["pairs"][('Andrea', 'Brad')], 6)
+        self.assertEqual(output["strong_pairs"], {('Andrea', 'Brad'): 6, ('Brad', 'Carter'): 7, ('Carter', 'Andrea'): 5})
+
+    def test_ballots_untouched(self):
+
+        # Generate data
+        input = [
+            {"count": 12, "ballot": [["Andrea"], ["Brad"], ["Carter"]]},
+            {"ballot": [["Carter"], ["Andrea"]]},
+        ]
+        original = copy.deepcopy(input)
+        SchulzeMethod(input, ballot_notation=SchulzeMethod.BALLOT_NOTATION_GROUPING).as_dict()
+
+        # Run tests
+        self.assertEqual(input, original)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,15 @@
-from py3votecore.consensus_under_deadline import ConsensusUnderDeadline, mdvr
+from py3votecore import consensus_under_deadline
+from py3votecore.consensus_under_deadline import ConsensusUnderDeadline, ConsensusEvent, mdvr, BACKEND_NATIVE, BACKEND_PYTHON, BACKEND_NUMPY, load_native, build_native
+from py3votecore.consensus_under_deadline import SHORTCUT_UNANIMOUS, SHORTCUT_NO_POSSIBLE_WINNER, SHORTCUT_SINGLE_POSSIBLE_WINNER
+import os
+import shutil
+import tempfile
 import unittest
 
+# the backends which can run here
+BACKENDS = [BACKEND_PYTHON] + ([BACKEND_NATIVE] if load_native() is not None else []) + \
+    ([BACKEND_NUMPY] if consensus_under_deadline.numpy is not None else [])
+
 class TestConsensusUnderDeadline(unittest.TestCase):
     def setUp(self) -> None:
         v = (1, 2, 3)
@@ -123,5 +132,215 @@ class TestConsensusUnderDeadline(unittest.TestCase):
         self.cud.voters_current_ballot = {1: 'a', 2:'a', 3:'a'}
         self.assertEqual(mdvr(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=[['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['a', 'c', 'b', 'd'], ['a', 'b', 'c', 'd'], ['a', 'b', 'd', 'c']], remaining_rounds=t, random_selection=False), 'a') # test case with unanimously on the start
 
+    def test_deploy_algorithm_state(self) -> None:
+        v = (1, 2, 3, 4, 5)
+        v_type = (1, 1, 1, 1, 0)
+        alters = ('a', 'b', 'c', 'd')
+        df_alter = 'null'
+        vp = [['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['b', 'c', 'a', 'd'], ['b', 'a', 'c', 'd'], ['c', 'b', 'd', 'a']]
+        self.cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=4, random_selection=False)
+        self.assertEqual(self.cud.deploy_algorithm(), 'b')
+        # the ballots and rounds left when the algorithm stopped
+        self.assertEqual(self.cud.voters_current_ballot, {1: 'b', 2: 'a', 3: 'b', 4: 'b', 5: 'c'})
+        self.assertEqual(self.cud.remaining_rounds, 2)
+
+    def test_incremental_votes(self) -> None:
+        v = (1, 2, 3, 4, 5)
+        v_type = (0, 0, 0, 0, 0)
+        alters = ('a', 'b', 'c', 'd')
+        df_alter = 'null'
+        vp = [['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['b', 'c', 'a', 'd'], ['b', 'a', 'c', 'd'], ['c', 'b', 'd', 'a']]
+        self.cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=3, random_selection=False)
+        self.assertEqual(self.cud.votes_score, {'a': 2, 'b': 2, 'c': 1, 'd': 0})
+        self.cud.change_vote(5, 'b', 'c')
+        self.cud.change_vote(1, 'b', 'a')
+        self.assertEqual(self.cud.votes_score, {'a': 1, 'b': 4, 'c': 0, 'd': 0})
+        self.assertEqual(self.cud.possible_winners(), ['a', 'b'])
+        # the possible winners follow the passing rounds
+        self.cud.round_passed()
+        self.cud.round_passed()
+        self.assertEqual(self.cud.possible_winners(), ['b'])
+        self.cud.round_passed()
+        self.cud.round_passed()
+        self.assertEqual(self.cud.possible_winners(), ['null'])
+
+    def test_backends(self) -> None:
+        v = (1, 2, 3, 4, 5)
+        v_type = (1, 1, 1, 1, 0)
+        alters = ('a', 'b', 'c', 'd')
+        df_alter = 'null'
+        vp = [['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['b', 'c', 'a', 'd'], ['b', 'a', 'c', 'd'], ['c', 'b', 'd', 'a']]
+        with self.assertRaises(ValueError):
+            ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=4, random_selection=False, backend='fortran')
+        for backend in BACKENDS:
+            self.cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=4, random_selection=False, backend=backend)
+            self.assertEqual(self.cud.deploy_algorithm(), 'b')
+            self.assertEqual(self.cud.voters_current_ballot, {1: 'b', 2: 'a', 3: 'b', 4: 'b', 5: 'c'})
+            self.assertEqual(self.cud.remaining_rounds, 2)
+            self.assertEqual(mdvr(voters=v, voters_type = (0, 0, 0, 0, 0), alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=2, random_selection=False, backend=backend), 'null')
+        # the numpy backend can't run without numpy
+        numpy = consensus_under_deadline.numpy
+        consensus_under_deadline.numpy = None
+        try:
+            self.cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=4, random_selection=False, backend=BACKEND_NUMPY)
+            with self.assertRaises(ImportError):
+                self.cud.deploy_algorithm()
+        finally:
+            consensus_under_deadline.numpy = numpy
+
+    def test_voted_default_alternative(self) -> None:
+        v = (1, 2, 3)
+        v_type = (0, 0, 0)
+        alters = ('a', 'c', 'null')
+        df_alter = 'null'
+        vp = [['a', 'c', 'null'], ['c', 'a', 'null'], ['null', 'c', 'a']]
+        for backend in BACKENDS:
+            # the default alternative has a vote but can't win, so the rounds go on until the deadline
+            self.cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=5, random_selection=False, backend=backend)
+            self.assertEqual(self.cud.deploy_algorithm(), 'null')
+            self.assertEqual(self.cud.voters_current_ballot, {1: 'a', 2: 'c', 3: 'null'})
+            self.assertEqual((self.cud.remaining_rounds, self.cud.shortcut), (-1, None))
+            # the same when no round can change the ballots
+            self.cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=1, random_selection=False, backend=backend)
+            self.assertEqual(self.cud.deploy_algorithm(), 'null')
+            self.assertEqual((self.cud.remaining_rounds, self.cud.shortcut), (-1, SHORTCUT_NO_POSSIBLE_WINNER))
+
+    @unittest.skipIf(consensus_under_deadline.numpy is None, 'no numpy')
+    def test_numpy_random_selection(self) -> None:
+        v = (1, 2, 3, 4, 5, 6)
+        v_type = (1, 1, 1, 0, 1, 0)
+        alters = ('a', 'b', 'c', 'd')
+        df_alter = 'null'
+        vp = [['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['b', 'c', 'a', 'd'], ['b', 'a', 'c', 'd'], ['c', 'b', 'd', 'a'], ['d', 'b', 'c', 'a']]
+        # the same seeds select the same voters on both backends
+        results = [ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=8, random_selection=True, backend=backend).simulate(100, seed=3)
+                   for backend in (BACKEND_PYTHON, BACKEND_NUMPY)]
+        self.assertEqual(results[0], results[1])
+
+    @unittest.skipIf(shutil.which(os.environ.get('CXX', 'c++')) is None, 'no C++ compiler')
+    def test_build_native_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            library = build_native(cache_dir)
+            self.assertTrue(os.path.exists(library))
+            built = os.path.getmtime(library)
+            # the same sources reuse the library already built
+            self.assertEqual(build_native(cache_dir), library)
+            self.assertEqual(os.path.getmtime(library), built)
+            self.assertEqual(os.listdir(cache_dir), [os.path.basename(library)])
+
+    def test_simulate(self) -> None:
+        v = (1, 2, 3, 4, 5, 6)
+        v_type = (1, 1, 1, 0, 1, 0)
+        alters = ('a', 'b', 'c', 'd')
+        df_alter = 'null'
+        vp = [['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['b', 'c', 'a', 'd'], ['b', 'a', 'c', 'd'], ['c', 'b', 'd', 'a'], ['d', 'b', 'c', 'a']]
+        self.cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=8, random_selection=True)
+        results = self.cud.simulate(200, seed=7)
+        self.assertEqual(results['trials'], 200)
+        self.assertAlmostEqual(sum(results['winners'].values()), 1.0)
+        self.assertEqual(results['default_frequency'], results['winners'].get(df_alter, 0.0))
+        self.assertLessEqual(results['rounds']['min'], results['rounds']['mean'])
+        self.assertLessEqual(results['rounds']['mean'], results['rounds']['max'])
+        # the trials are reproducible, and don't depend on the number of workers
+        self.assertEqual(self.cud.simulate(200, seed=7), results)
+        self.assertEqual(self.cud.simulate(200, seed=7, workers=2), results)
+        # the trials don't change the object's state
+        self.assertEqual(self.cud.voters_current_ballot, {1: 'a', 2: 'a', 3: 'b', 4: 'b', 5: 'c', 6: 'd'})
+        self.assertEqual(self.cud.remaining_rounds, 8)
+        with self.assertRaises(ValueError):
+            self.cud.simulate(0)
+        # every backend finds the same winners and rounds, including with the default alternative voted for
+        for alters, vp in [(alters, vp), (alters + (df_alter,), [[df_alter] + preference for preference in vp[:2]] + vp[2:])]:
+            results = [ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=8, random_selection=True, backend=backend).simulate(200, seed=7)
+                       for backend in BACKENDS]
+            for backend_results in results[1:]:
+                self.assertEqual(backend_results['winners'], results[0]['winners'])
+                self.assertEqual(backend_results['rounds'], results[0]['rounds'])
+
+    def test_trace(self) -> None:
+        v = (1, 2, 3, 4, 5)
+        v_type = (1, 1, 1, 1, 0)
+        alters = ('a', 'b', 'c', 'd')
+        df_alter = 'null'
+        vp = [['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['b', 'c', 'a', 'd'], ['b', 'a', 'c', 'd'], ['c', 'b', 'd', 'a']]
+        for backend in BACKENDS:
+            events = []
+            self.assertEqual(mdvr(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=4, random_selection=False, backend=backend, trace=events.append), 'b')
+            self.assertEqual(events, [ConsensusEvent(3, 1, 'a', 'b', ('a', 'b', 'c'))])
+        # importing the module doesn't configure logging
+        self.assertEqual(consensus_under_deadline.logger.name, 'py3votecore.consensus_under_deadline')
+
+    def test_closed_form_outcome(self) -> None:
+        v = (1, 2, 3, 4, 5)
+        v_type = (0, 0, 0, 0, 0)
+        alters = ('a', 'b', 'c', 'd')
+        df_alter = 'null'
+        vp = [['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['b', 'c', 'a', 'd'], ['b', 'a', 'c', 'd'], ['c', 'b', 'd', 'a']]
+        # unanimously on the start
+        self.cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=[['a', 'b']] * 5, remaining_rounds=4, random_selection=False)
+        self.assertEqual(self.cud.deploy_algorithm(), 'a')
+        self.assertEqual((self.cud.remaining_rounds, self.cud.shortcut), (3, SHORTCUT_UNANIMOUS))
+        # no alternative can get every vote in time
+        self.cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=2, random_selection=False)
+        self.assertEqual(self.cud.deploy_algorithm(), 'null')
+        self.assertEqual((self.cud.remaining_rounds, self.cud.shortcut), (-1, SHORTCUT_NO_POSSIBLE_WINNER))
+        # only one alternative can get every vote in time
+        self.cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=[['a', 'b']] * 4 + [['b', 'a']], remaining_rounds=1, random_selection=False)
+        self.assertEqual(self.cud.deploy_algorithm(), 'a')
+        self.assertEqual((self.cud.remaining_rounds, self.cud.shortcut), (0, SHORTCUT_SINGLE_POSSIBLE_WINNER))
+        # otherwise the rounds are run
+        self.cud = ConsensusUnderDeadline(voters=v, voters_type = (1, 1, 1, 1, 0), alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=4, random_selection=False)
+        self.assertEqual(self.cud.deploy_algorithm(), 'b')
+        self.assertEqual((self.cud.remaining_rounds, self.cud.shortcut), (2, None))
+
+    def test_voter_ids(self) -> None:
+        v = (50, 10, 40, 20, 30)
+        v_type = (1, 1, 1, 1, 0)
+        alters = ('a', 'b', 'c', 'd')
+        df_alter = 'null'
+        vp = [['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['b', 'c', 'a', 'd'], ['b', 'a', 'c', 'd'], ['c', 'b', 'd', 'a']]
+        for backend in BACKENDS:
+            # each voter's preferences are found by their position, whatever their id
+            self.cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=4, random_selection=False, backend=backend)
+            self.assertEqual(self.cud.voters_current_ballot, {50: 'a', 10: 'a', 40: 'b', 20: 'b', 30: 'c'})
+            # voter 10 is the smallest active one, changing to 'c' and then to 'b'
+            self.assertEqual(self.cud.deploy_algorithm(), 'b')
+            self.assertEqual(self.cud.voters_current_ballot, {50: 'a', 10: 'b', 40: 'b', 20: 'b', 30: 'c'})
+            self.assertEqual(self.cud.remaining_rounds, 1)
+            # any int is a voter's id, the largest one included
+            cud = ConsensusUnderDeadline(voters=(2 ** 31 - 1,) + v[1:], voters_type = (1, 0, 0, 0, 0), alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=4, random_selection=False, backend=backend)
+            self.assertEqual(cud.deploy_algorithm(), 'b')
+            self.assertEqual(cud.voters_current_ballot, {2 ** 31 - 1: 'b', 10: 'a', 40: 'b', 20: 'b', 30: 'c'})
+        with self.assertRaises(ValueError):
+            self.cud.change_vote(1, 'b', 'a')
+        self.cud.change_vote(50, 'b', 'a')
+        self.assertEqual(self.cud.votes_score, {'a': 0, 'b': 4, 'c': 1, 'd': 0})
+
+    def test_sweep(self) -> None:
+        v = (1, 2, 3, 4, 5, 6)
+        v_type = (1, 0, 1, 0, 1, 0)
+        alters = ('a', 'b', 'c', 'd')
+        df_alter = 'null'
+        vp = [['a', 'b', 'c', 'd'], ['a', 'c', 'b', 'd'], ['b', 'c', 'a', 'd'], ['b', 'a', 'c', 'd'], ['c', 'b', 'd', 'a'], ['d', 'b', 'c', 'a']]
+        self.cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=3, random_selection=False)
+        winners = self.cud.sweep(12)
+        # the same winners as running the algorithm for each deadline
+        self.assertEqual(winners, {t: mdvr(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=t, random_selection=False)
+                                   for t in range(13)})
+        self.assertEqual(winners[3], 'null')
+        self.assertEqual(winners[12], 'b')
+        # the sweep doesn't change the object's state
+        self.assertEqual(self.cud.voters_current_ballot, {1: 'a', 2: 'a', 3: 'b', 4: 'b', 5: 'c', 6: 'd'})
+        self.assertEqual(self.cud.remaining_rounds, 3)
+        # the default alternative voted for isn't possible to win in place of the others
+        self.cud = ConsensusUnderDeadline(voters=(1, 2, 3), voters_type = (0, 0, 0), alternatives=('a', 'c', 'null'), default_alternative=df_alter,voters_preferences=[['a', 'c', 'null'], ['c', 'a', 'null'], ['null', 'c', 'a']], remaining_rounds=0, random_selection=False)
+        self.assertEqual(self.cud.possible_winners_at(0), set())
+        self.assertEqual(self.cud.sweep(6), dict.fromkeys(range(7), 'null'))
+        with self.assertRaises(ValueError):
+            self.cud.sweep(-1)
+        self.cud = ConsensusUnderDeadline(voters=v, voters_type = v_type, alternatives=alters, default_alternative=df_alter,voters_preferences=vp, remaining_rounds=3, random_selection=True)
+        with self.assertRaises(ValueError):
+            self.cud.sweep(12)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
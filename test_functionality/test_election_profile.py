@@ -0,0 +1,60 @@
+# Copyright (C) 2009, Brad Beattie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from py3votecore.condorcet import ElectionProfile
+from py3votecore.ranked_pairs import RankedPairs
+from py3votecore.schulze_method import SchulzeMethod
+from py3votecore.schulze_npr import SchulzeNPR
+import unittest
+import copy
+
+
+class TestElectionProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.input = [
+            {"count": 12, "ballot": [["Andrea"], ["Brad"], ["Carter"]]},
+            {"count": 26, "ballot": [["Andrea"], ["Carter"], ["Brad"]]},
+            {"count": 12, "ballot": [["Andrea"], ["Carter"], ["Brad"]]},
+            {"count": 13, "ballot": [["Carter"], ["Andrea"], ["Brad"]]},
+            {"count": 27, "ballot": [["Brad"]]},
+        ]
+
+    def test_precomputation(self):
+        original = copy.deepcopy(self.input)
+        profile = ElectionProfile(self.input, ballot_notation=ElectionProfile.BALLOT_NOTATION_GROUPING)
+
+        # Run tests
+        self.assertEqual(self.input, original)
+        self.assertEqual(profile.candidate_list, ['Andrea', 'Brad', 'Carter'])
+        self.assertEqual(len(profile.rankings), 4)
+        self.assertEqual(sorted(profile.counts), [12, 13, 27, 38])
+        self.assertEqual(profile.pairwise, [[0, 63, 50], [27, 0, 39], [13, 51, 0]])
+        self.assertEqual(profile.first_preferences, {'Andrea': 50, 'Brad': 27, 'Carter': 13})
+
+    def test_several_methods(self):
+        profile = ElectionProfile(self.input, ballot_notation=ElectionProfile.BALLOT_NOTATION_GROUPING)
+        schulze = SchulzeMethod(profile).as_dict()
+        ranked_pairs = RankedPairs(profile).as_dict()
+        npr = SchulzeNPR(profile).as_dict()
+
+        # Run tests
+        self.assertEqual(schulze, SchulzeMethod(copy.deepcopy(self.input), ballot_notation=SchulzeMethod.BALLOT_NOTATION_GROUPING).as_dict())
+        self.assertEqual(ranked_pairs["winner"], 'Andrea')
+        self.assertEqual(ranked_pairs["pairs"], schulze["pairs"])
+        self.assertEqual(npr["order"], ['Andrea', 'Carter', 'Brad'])
+
+if __name__ == "__main__":
+    unittest.main()
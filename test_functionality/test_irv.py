@@ -33,7 +33,6 @@ class TestInstantRunoff(unittest.TestCase):
         # Run tests
         self.assertEqual(output, {
             'candidates': set(['c1', 'c2', 'c3']),
-            'quota': 35,
             'winner': 'c3',
             'rounds': [
                 {'tallies': {'c3': 23.0, 'c2': 20.0, 'c1': 26.0}, 'loser': 'c2'},
@@ -53,7 +52,7 @@ class TestInstantRunoff(unittest.TestCase):
         output = IRV(input).as_dict()
 
         # Run tests
-        self.assertEqual(output["quota"], 34)
+        self.assertFalse("quota" in output)
         self.assertEqual(len(output["rounds"]), 2)
         self.assertEqual(len(output["rounds"][0]), 3)
         self.assertEqual(output["rounds"][0]["tallies"], {'c1': 26, 'c2': 20, 'c3': 20})
@@ -77,12 +76,111 @@ class TestInstantRunoff(unittest.TestCase):
         # Run tests
         self.assertEqual(output, {
             'candidates': set(['c1', 'c2', 'c3']),
-            'quota': 49,
             'winner': 'c1',
             'rounds': [
                 {'tallies': {'c3': 20.0, 'c2': 20.0, 'c1': 56.0}, 'winner': 'c1'}
             ]
         })
 
+    # IRV, several trailing candidates eliminated in a single round
+    def test_irv_batch_elimination(self):
+
+        # Generate data
+        input = [
+            {"count": 40, "ballot": ["c1", "c2"]},
+            {"count": 35, "ballot": ["c2", "c1"]},
+            {"count": 10, "ballot": ["c3", "c2"]},
+            {"count": 8, "ballot": ["c4", "c3", "c1"]},
+            {"count": 7, "ballot": ["c5", "c1"]}
+        ]
+        output = IRV(input).as_dict()
+
+        # Run tests
+        self.assertEqual(output, {
+            'candidates': set(['c1', 'c2', 'c3', 'c4', 'c5']),
+            'winner': 'c1',
+            'rounds': [
+                {'tallies': {'c1': 40.0, 'c2': 35.0, 'c3': 10.0, 'c4': 8.0, 'c5': 7.0}, 'losers': set(['c3', 'c4', 'c5'])},
+                {'tallies': {'c1': 55.0, 'c2': 45.0}, 'winner': 'c1'}
+            ]
+        })
+
+    # IRV, prefix tree ballot store
+    def test_irv_ballot_tree(self):
+
+        # Generate data
+        input = [
+            {"count": 26, "ballot": ["c1", "c2", "c3"]},
+            {"count": 20, "ballot": ["c2", "c3", "c1"]},
+            {"count": 23, "ballot": ["c3", "c1", "c2"]}
+        ]
+        output = IRV(input, ballot_store=IRV.BALLOT_STORE_TREE).as_dict()
+
+        # Run tests
+        self.assertEqual(output, {
+            'candidates': set(['c1', 'c2', 'c3']),
+            'winner': 'c3',
+            'rounds': [
+                {'tallies': {'c3': 23.0, 'c2': 20.0, 'c1': 26.0}, 'loser': 'c2'},
+                {'tallies': {'c3': 43.0, 'c1': 26.0}, 'winner': 'c3'}
+            ]
+        })
+
+    # IRV, shared memory ballot store
+    def test_irv_parallel(self):
+
+        # Generate data
+        input = [
+            {"count": 40, "ballot": ["c1", "c2"]},
+            {"count": 35, "ballot": ["c2", "c1"]},
+            {"count": 10, "ballot": ["c3", "c2"]},
+            {"count": 8, "ballot": ["c4", "c3", "c1"]},
+            {"count": 7, "ballot": ["c5", "c1"]}
+        ]
+        output = IRV(input, ballot_store=IRV.BALLOT_STORE_PARALLEL, workers=2).as_dict()
+
+        # Run tests
+        self.assertEqual(output["winner"], 'c1')
+        self.assertEqual(output["rounds"][1], {'tallies': {'c1': 55.0, 'c2': 45.0}, 'winner': 'c1'})
+
+    # IRV, delta round log
+    def test_irv_delta_round_log(self):
+
+        # Generate data
+        input = [
+            {"count": 26, "ballot": ["c1", "c2", "c3"]},
+            {"count": 20, "ballot": ["c2", "c3", "c1"]},
+            {"count": 23, "ballot": ["c3", "c1", "c2"]}
+        ]
+        irv = IRV(input, round_log=IRV.ROUND_LOG_DELTA)
+
+        # Run tests
+        self.assertEqual(irv.rounds, [
+            {'tallies': {'c3': 23.0, 'c2': 20.0, 'c1': 26.0}, 'loser': 'c2'},
+            {'tallies': {'c3': 43.0}, 'winner': 'c3'}
+        ])
+        self.assertEqual(irv.round_tallies(1), {'c3': 43.0, 'c1': 26.0})
+
+    # IRV, electing on a majority of the continuing votes below the Droop quota
+    def test_irv_continuing_majority(self):
+
+        # Generate data
+        input = [
+            {"count": 10, "ballot": ["c1"]},
+            {"count": 6, "ballot": ["c2"]},
+            {"count": 5, "ballot": ["c3"]}
+        ]
+        output = IRV(input).as_dict()
+
+        # Run tests
+        self.assertEqual(output, {
+            'candidates': set(['c1', 'c2', 'c3']),
+            'rounds': [
+                {'tallies': {'c1': 10.0, 'c2': 6.0, 'c3': 5.0}, 'loser': 'c3'},
+                {'tallies': {'c1': 10.0, 'c2': 6.0}, 'winner': 'c1'}
+            ],
+            'winner': 'c1'
+        })
+
 if __name__ == "__main__":
     unittest.main()
@@ -73,6 +73,42 @@ class TestPluralityAtLarge(unittest.TestCase):
         self.assertTrue("c1" in output["winners"] and ("c2" in output["winners"] or "c3" in output["winners"]))
         self.assertEqual(len(output), 5)
 
+    # Plurality at Large, with counts past a float's exact integers
+    def test_plurality_at_large_large_counts(self):
+
+        # Generate data
+        output = PluralityAtLarge([
+            {"count": 2 ** 53 + 1, "ballot": ["c1", "c2"]},
+            {"count": 2 ** 53, "ballot": ["c2"]},
+            {"count": 1, "ballot": ["c1"]}
+        ], required_winners=2).as_dict()
+        huge = PluralityAtLarge([
+            {"count": 2 ** 70, "ballot": ["c1"]},
+            {"count": 1, "ballot": ["c2"]}
+        ]).as_dict()
+
+        # Run tests
+        self.assertEqual(output["tallies"], {'c1': 2 ** 53 + 2, 'c2': 2 ** 54 + 1})
+        self.assertEqual(huge["tallies"], {'c1': 2 ** 70, 'c2': 1})
+
+    # Plurality at Large, leaving the ballots untouched
+    def test_plurality_at_large_ballots_untouched(self):
+
+        # Generate data
+        input = [
+            {"ballot": "c1"},
+            {"count": 2, "ballot": "c2"},
+            {"count": 2, "ballot": ["c1"]},
+        ]
+        output = PluralityAtLarge(input).as_dict()
+
+        # Run tests
+        self.assertEqual(output["tallies"], {'c1': 3, 'c2': 2})
+        self.assertEqual(input, [
+            {"ballot": "c1"},
+            {"count": 2, "ballot": "c2"},
+            {"count": 2, "ballot": ["c1"]},
+        ])
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,74 @@
+# Copyright (C) 2009, Brad Beattie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from py3votecore.plurality import Plurality
+from py3votecore.plurality_at_large import PluralityAtLarge
+from py3votecore.plurality_tally import PluralityTally
+import unittest
+
+
+class TestPluralityTally(unittest.TestCase):
+
+    # Precincts counted separately, then merged
+    def test_merged_precincts(self):
+
+        # Generate data
+        precinct_1 = PluralityTally(iter([
+            {"count": 26, "ballot": ["c1", "c2"]},
+            {"count": 22, "ballot": ["c1", "c3"]},
+        ]), required_winners=2)
+        precinct_2 = PluralityTally(required_winners=2)
+        precinct_2.add_ballot({"count": 23, "ballot": ["c2", "c3"]})
+        precinct_3 = PluralityTally.from_dict(PluralityTally([{"ballot": "c4"}], required_winners=2).as_dict())
+        output = PluralityAtLarge(sum([precinct_1, precinct_2, precinct_3]), required_winners=2).as_dict()
+
+        # Run tests
+        self.assertEqual(precinct_3.as_dict(), {'required_winners': 2, 'tallies': {'c4': 1}})
+        self.assertEqual(output, {
+            'candidates': set(['c1', 'c2', 'c3', 'c4']),
+            'tallies': {'c3': 45, 'c2': 49, 'c1': 48, 'c4': 1},
+            'winners': set(['c2', 'c1'])
+        })
+
+    # Single winner plurality from a tally
+    def test_plurality(self):
+
+        # Generate data
+        tally = PluralityTally([
+            {"count": 26, "ballot": "c1"},
+            {"count": 22, "ballot": "c2"},
+            {"count": 22, "ballot": "c3"}
+        ]) + PluralityTally([{"count": 5, "ballot": "c2"}])
+        output = Plurality(tally).as_dict()
+
+        # Run tests
+        self.assertEqual(output, {
+            'candidates': set(['c1', 'c2', 'c3']),
+            'tallies': {'c1': 26, 'c2': 27, 'c3': 22},
+            'winner': 'c2'
+        })
+
+    # Over-votes are rejected as they stream in
+    def test_too_many_candidates(self):
+        tally = PluralityTally(required_winners=2)
+        with self.assertRaises(Exception):
+            tally.add_ballot({"ballot": ["c1", "c2", "c3"]})
+        with self.assertRaises(Exception):
+            tally + PluralityTally(required_winners=1)
+        with self.assertRaises(Exception):
+            PluralityAtLarge(PluralityTally(required_winners=2))
+
+if __name__ == "__main__":
+    unittest.main()
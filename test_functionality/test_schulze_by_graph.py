@@ -44,6 +44,27 @@ class TestSchulzeMethodByGraph(unittest.TestCase):
             'winner': 'a',
         })
 
+    def test_matrix_example(self):
+
+        # Generate data
+        input = [
+            [0, 4, 4],
+            [3, 0, 4],
+            [3, 3, 0],
+        ]
+        output = SchulzeMethodByGraph(input, candidates=['a', 'b', 'c']).as_dict()
+
+        # Run tests
+        self.assertEqual(output["pairs"], {
+            ('a', 'b'): 4,
+            ('b', 'a'): 3,
+            ('a', 'c'): 4,
+            ('c', 'a'): 3,
+            ('b', 'c'): 4,
+            ('c', 'b'): 3,
+        })
+        self.assertEqual(output["winner"], 'a')
+
 
 class TestSchulzeNPRByGraph(unittest.TestCase):
 
@@ -99,5 +120,32 @@ class TestSchulzeNPRByGraph(unittest.TestCase):
             'order': ['a', 'd', 'b'],
         })
 
+    def test_matrix_example(self):
+
+        # Generate data
+        input = [
+            [0, 4, 4, 4],
+            [3, 0, 4, 4],
+            [3, 3, 0, 4],
+            [4, 4, 4, 0],
+        ]
+        output = SchulzeNPRByGraph(input, candidates=['a', 'b', 'c', 'd'], winner_threshold=3, tie_breaker=['a', 'd', 'c', 'b']).as_dict()
+
+        # Run tests
+        self.assertEqual(output, {
+            'candidates': set(['a', 'b', 'c', 'd']),
+            'tie_breaker': ['a', 'd', 'c', 'b'],
+            'rounds': [
+                {'winner': 'a', 'tied_winners': set(['a', 'd'])},
+                {'winner': 'd', 'tied_winners': set(['b', 'd'])},
+                {'winner': 'b'},
+            ],
+            'order': ['a', 'd', 'b'],
+        })
+
+    def test_matrix_mismatch(self):
+        with self.assertRaises(Exception):
+            SchulzeNPRByGraph([[0, 1], [1, 0]], candidates=['a', 'b', 'c'])
+
 if __name__ == "__main__":
     unittest.main()
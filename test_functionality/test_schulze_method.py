@@ -14,6 +14,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from py3votecore.schulze_method import SchulzeMethod
+from py3votecore.schulze_helper import SchulzeHelper
 import unittest
 
 
@@ -171,5 +172,18 @@ class TestSchulzeMethod(unittest.TestCase):
         # Run tests
         self.assertEqual(output_tuple, output_list)
 
+    def test_strongly_connected_components(self):
+
+        # Generate data: a cycle 0 -> 1 -> 2 -> 0 leading to 3 <-> 4, and a
+        # chain too long for a recursive search
+        successors = [1 << 1, 1 << 2, 1 << 0 | 1 << 3, 1 << 4, 1 << 3]
+        length = 5000
+        chain = [1 << (i + 1) for i in range(length - 1)] + [0]
+
+        # Run tests
+        self.assertEqual(sorted(SchulzeHelper.strongly_connected_components(successors, 0b11111)), [0b00111, 0b11000])
+        self.assertEqual(sorted(SchulzeHelper.strongly_connected_components(successors, 0b11011)), [0b00001, 0b00010, 0b11000])
+        self.assertEqual(len(SchulzeHelper.strongly_connected_components(chain, (1 << length) - 1)), length)
+
 if __name__ == "__main__":
     unittest.main()
@@ -13,8 +13,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from py3votecore.abstract_classes import AbstractOrderingVotingSystem
+from py3votecore.condorcet import SparseBallot
+from py3votecore.schulze_method import SchulzeMethod
 from py3votecore.schulze_npr import SchulzeNPR
+from py3votecore.tie_breaker import TieBreaker
 import unittest
+import copy
 
 
 class TestSchulzeNPR(unittest.TestCase):
@@ -62,6 +67,73 @@ class TestSchulzeNPR(unittest.TestCase):
             ]
         })
 
+    def test_cycle(self):
+
+        # Generate data
+        input = [
+            {"count": 5, "ballot": {"A": 1, "B": 2, "C": 3, "D": 4}},
+            {"count": 4, "ballot": {"B": 1, "C": 2, "A": 3, "D": 4}},
+            {"count": 3, "ballot": {"C": 1, "A": 2, "B": 3, "D": 4}},
+            {"count": 2, "ballot": {"D": 1, "C": 2, "B": 3, "A": 4}},
+        ]
+        output = SchulzeNPR(input, winner_threshold=2, ballot_notation=SchulzeNPR.BALLOT_NOTATION_RANKING).as_dict()
+
+        # Run tests
+        self.assertEqual(output, {
+            'order': ['B', 'C'],
+            'candidates': set(['A', 'B', 'C', 'D']),
+            'rounds': [
+                {'winner': 'B'},
+                {'winner': 'C'}
+            ]
+        })
+
+    def test_seeded_tie_breaker(self):
+
+        # Generate data
+        input = [
+            {"count": 1, "ballot": {"A": 1, "B": 1, "C": 2, "D": 2}},
+        ]
+        outputs = []
+        for i in range(2):
+            tie_breaker = TieBreaker(seed=2009)
+            npr = SchulzeNPR(copy.deepcopy(input), tie_breaker=tie_breaker, ballot_notation=SchulzeNPR.BALLOT_NOTATION_RANKING)
+            self.assertTrue(npr.tie_breaker is tie_breaker)
+            outputs.append(npr.as_dict())
+
+        # Run tests
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(len(outputs[0]["tie_breaker"]), 4)
+        self.assertEqual(outputs[0]["rounds"][0]["tied_winners"], set(['A', 'B']))
+        self.assertEqual(set(outputs[0]["order"][:2]), set(['A', 'B']))
+
+    # The generic ordering loop, rerunning a single winner election per
+    # position, still orders the candidates as SchulzeNPR does
+    def test_generic_ordering(self):
+
+        class SequentialSchulzeNPR(AbstractOrderingVotingSystem):
+            def __init__(self, ballots, winner_threshold=None):
+                super(SequentialSchulzeNPR, self).__init__(ballots, single_winner_class=SchulzeMethod, winner_threshold=winner_threshold)
+            ballots_without_candidate = staticmethod(SchulzeNPR.ballots_without_candidate)
+
+        # Generate data
+        input = [
+            {"count": 5, "ballot": {"A": 1, "B": 2, "C": 3, "D": 4}},
+            {"count": 4, "ballot": {"B": 1, "C": 2, "A": 3, "D": 4}},
+            {"count": 3, "ballot": {"C": 1, "A": 2, "B": 3, "D": 4}},
+            {"count": 2, "ballot": {"D": 1, "C": 2, "B": 3, "A": 4}},
+        ]
+        npr = SchulzeNPR(input, ballot_notation=SchulzeNPR.BALLOT_NOTATION_RANKING)
+        ballots = copy.deepcopy(npr.ballots)
+        output = SequentialSchulzeNPR(ballots).as_dict()
+
+        # Run tests
+        self.assertEqual(output["order"], npr.as_dict()["order"])
+        self.assertEqual(ballots, npr.ballots)
+        remaining_ballots = SchulzeNPR.ballots_without_candidate(ballots, "A")
+        self.assertTrue(isinstance(remaining_ballots[0]["ballot"], SparseBallot))
+        self.assertEqual(remaining_ballots[0]["ballot"]["A"], ballots[0]["ballot"].lowest_preference)
+        self.assertEqual(ballots, npr.ballots)
 
 if __name__ == "__main__":
     unittest.main()
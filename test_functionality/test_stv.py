@@ -15,6 +15,7 @@
 
 from py3votecore.stv import STV
 import unittest
+import copy
 
 
 class TestSTV(unittest.TestCase):
@@ -197,7 +198,108 @@ class TestSTV(unittest.TestCase):
         # Run tests
         self.assertEqual(output["winners"], set(["A", "B", "C"]))
 
+    # STV, prefix tree ballot store matches the list store
+    def test_stv_ballot_tree(self):
 
+        # Generate data
+        input = [
+            {"count": 4, "ballot": ["orange"]},
+            {"count": 2, "ballot": ["pear", "orange"]},
+            {"count": 8, "ballot": ["chocolate", "strawberry"]},
+            {"count": 4, "ballot": ["chocolate", "sweets"]},
+            {"count": 1, "ballot": ["strawberry"]},
+            {"count": 1, "ballot": ["sweets"]}
+        ]
+        output_list = STV(copy.deepcopy(input), required_winners=3).as_dict()
+        output_tree = STV(copy.deepcopy(input), required_winners=3, ballot_store=STV.BALLOT_STORE_TREE).as_dict()
+
+        # Run tests
+        self.assertEqual(output_tree, output_list)
+
+    # STV, prefix tree ballot store through resets
+    def test_stv_ballot_tree_reset(self):
+
+        # Generate data
+        input = [
+            {"count": 1, "ballot": ["c1", "c3", "c4"]},
+            {"count": 1, "ballot": ["c2", "c3", "c4"]},
+        ]
+        output = STV(input, required_winners=3, ballot_store=STV.BALLOT_STORE_TREE).as_dict()
+
+        # Run tests
+        self.assertEqual(output, {
+            'candidates': set(['c1', 'c2', 'c3', 'c4']),
+            'quota': 1,
+            'rounds': [
+                {'tallies': {'c1': 1.0, 'c2': 1.0, 'c3': 0, 'c4': 0}, 'winners': set(['c1', 'c2'])},
+                {'note': 'reset', 'tallies': {'c3': 2.0, 'c4': 0}, 'winners': set(['c3'])},
+            ],
+            'winners': set(['c1', 'c2', 'c3'])
+        })
+
+    # STV, delta round log
+    def test_stv_delta_round_log(self):
+
+        # Generate data
+        input = [
+            {"count": 4, "ballot": ["orange"]},
+            {"count": 2, "ballot": ["pear", "orange"]},
+            {"count": 8, "ballot": ["chocolate", "strawberry"]},
+            {"count": 4, "ballot": ["chocolate", "sweets"]},
+            {"count": 1, "ballot": ["strawberry"]},
+            {"count": 1, "ballot": ["sweets"]}
+        ]
+        stv = STV(input, required_winners=3, round_log=STV.ROUND_LOG_DELTA)
+
+        # Run tests
+        self.assertEqual(stv.as_dict(), {
+            'candidates': set(['orange', 'pear', 'chocolate', 'strawberry', 'sweets']),
+            'quota': 6,
+            'round_log': 'delta',
+            'rounds': [
+                {'tallies': {'orange': 4.0, 'strawberry': 1.0, 'pear': 2.0, 'sweets': 1.0, 'chocolate': 12.0}, 'winners': set(['chocolate'])},
+                {'tallies': {'strawberry': 5.0, 'sweets': 3.0}, 'loser': 'pear'},
+                {'tallies': {'orange': 6.0}, 'winners': set(['orange'])},
+                {'tallies': {}, 'loser': 'sweets'}
+            ],
+            'remaining_candidates': set(['strawberry']),
+            'winners': set(['orange', 'strawberry', 'chocolate'])
+        })
+        self.assertEqual(stv.round_tallies(3), {'strawberry': 5.0, 'sweets': 3.0})
+
+    # STV, no round log
+    def test_stv_no_round_log(self):
+
+        # Generate data
+        input = [
+            {"count": 1, "ballot": ["c1", "c3", "c4"]},
+            {"count": 1, "ballot": ["c2", "c3", "c4"]},
+        ]
+        stv = STV(input, required_winners=3, round_log=STV.ROUND_LOG_NONE)
+
+        # Run tests
+        self.assertEqual(stv.rounds, [
+            {'winners': set(['c1', 'c2'])},
+            {'note': 'reset', 'winners': set(['c3'])},
+        ])
+        self.assertEqual(stv.round_tallies(0), {'c1': 1.0, 'c2': 1.0, 'c3': 0, 'c4': 0})
+        self.assertEqual(stv.round_tallies(-1), {'c3': 2.0, 'c4': 0})
+
+    # STV, leaving the ballots untouched
+    def test_stv_ballots_untouched(self):
+
+        # Generate data
+        input = [
+            {"count": 56, "ballot": ["c1", "c2", "c3"]},
+            {"ballot": ["c2", "c3", "c1"]},
+            {"count": 20, "ballot": ["c3", "c1", "c2"]}
+        ]
+        original = copy.deepcopy(input)
+        output = STV(input, required_winners=2).as_dict()
+
+        # Run tests
+        self.assertEqual(output["winners"], set(['c1', 'c2']))
+        self.assertEqual(input, original)
 
 if __name__ == "__main__":
     unittest.main()
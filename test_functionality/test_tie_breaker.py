@@ -47,5 +47,30 @@ class TestTieBreaker(unittest.TestCase):
             ('c', 'b')
         )
 
+    def test_wide_tuple_tie(self):
+        self.assertEqual(
+            self.tieBreaker.break_ties(set([('b', 'c', 'd'), ('b', 'c', 'a'), ('b', 'd', 'a')])),
+            ('b', 'c', 'a')
+        )
+        self.assertEqual(
+            self.tieBreaker.break_ties(set([('b', 'c', 'd'), ('b', 'c', 'a'), ('b', 'd', 'a')]), reverse=True),
+            ('b', 'd', 'a')
+        )
+
+    def test_reordering(self):
+        self.tieBreaker.random_ordering = ['d', 'c', 'b', 'a']
+        self.assertEqual(self.tieBreaker.break_ties(set(['b', 'c'])), 'c')
+        self.assertEqual(self.tieBreaker.as_list(), ['d', 'c', 'b', 'a'])
+
+    def test_seeded_ordering(self):
+        first = TieBreaker(set(['a', 'b', 'c', 'd', 'e']), seed=7)
+        second = TieBreaker(seed=7).prepare(set(['e', 'd', 'c', 'b', 'a']))
+        self.assertEqual(first.as_list(), second.as_list())
+        self.assertEqual(sorted(first.as_list()), ['a', 'b', 'c', 'd', 'e'])
+
+        # Once drawn, the ordering is kept
+        second.prepare(set(['a', 'b']))
+        self.assertEqual(first.as_list(), second.as_list())
+
 if __name__ == "__main__":
     unittest.main()
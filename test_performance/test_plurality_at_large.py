@@ -0,0 +1,59 @@
+# Copyright (C) 2009, Brad Beattie
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from py3votecore.plurality_at_large import PluralityAtLarge
+import random
+import time
+import unittest
+
+
+class TestPluralityAtLarge(unittest.TestCase):
+
+    # The tally should keep up with the plain dictionary loop it replaced, on a
+    # large block vote of 3 seats among 50 candidates
+    def test_count_votes_against_dict_loop(self):
+
+        # Generate data
+        generator = random.Random(3)
+        candidates = ["c%d" % i for i in range(50)]
+        ballots = [
+            {"count": generator.randint(1, 9), "ballot": generator.sample(candidates, 3)}
+            for i in range(200000)
+        ]
+
+        def dict_loop():
+            tallies = dict.fromkeys(candidates, 0)
+            for ballot in ballots:
+                for candidate in ballot["ballot"]:
+                    tallies[candidate] += ballot["count"]
+            return tallies
+
+        def timed(function):
+            times = []
+            for i in range(3):
+                startTime = time.time()
+                result = function()
+                times.append(time.time() - startTime)
+            return result, min(times)
+
+        expected, baseline = timed(dict_loop)
+        tallies, elapsed = timed(lambda: PluralityAtLarge.count_votes(set(candidates), ballots))
+
+        # Run tests
+        self.assertEqual(tallies, expected)
+        self.assertTrue(elapsed < baseline * 1.25)
+
+if __name__ == "__main__":
+    unittest.main()